@@ -0,0 +1,102 @@
+from typing import Any, Dict, List, Optional, Union
+from xml.parsers import expat
+
+# =====================
+# Streaming arXiv Atom Parser
+# =====================
+ATOM_NS = "http://www.w3.org/2005/Atom"
+ARXIV_NS = "http://arxiv.org/schemas/atom"
+_SEP = "|"
+
+# Elements of an entry whose text is kept, keyed by their namespaced expat name
+_TEXT_FIELDS = {
+    f"{ATOM_NS}{_SEP}id": "id",
+    f"{ATOM_NS}{_SEP}title": "title",
+    f"{ATOM_NS}{_SEP}summary": "summary",
+    f"{ATOM_NS}{_SEP}published": "published",
+    f"{ATOM_NS}{_SEP}updated": "updated",
+}
+_ENTRY = f"{ATOM_NS}{_SEP}entry"
+_AUTHOR_NAME = f"{ATOM_NS}{_SEP}name"
+_LINK = f"{ATOM_NS}{_SEP}link"
+_CATEGORY = f"{ATOM_NS}{_SEP}category"
+_PRIMARY_CATEGORY = f"{ARXIV_NS}{_SEP}primary_category"
+
+
+class ArxivAtomParser:
+    """
+    Incremental expat parser for arXiv API responses. Data may be fed in chunks and each
+    <entry> is turned straight into a compact record as soon as it closes:
+    {'title', 'link', 'summary', 'published', 'updated', 'authors': [...], 'categories': [...]}.
+    Nothing outside entries is kept, and no generic feed tree is built.
+    """
+    def __init__(self):
+        self._parser = expat.ParserCreate(namespace_separator=_SEP)
+        self._parser.buffer_text = True
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._text
+        self._entry: Optional[Dict[str, Any]] = None
+        self._field: Optional[str] = None
+        self._chunks: List[str] = []
+        self._ready: List[Dict[str, Any]] = []
+
+    def _start(self, name: str, attrs: Dict[str, str]) -> None:
+        if name == _ENTRY:
+            self._entry = {"authors": [], "categories": [], "link": ""}
+            return
+        entry = self._entry
+        if entry is None:
+            return
+        field = _TEXT_FIELDS.get(name)
+        if field is not None or name == _AUTHOR_NAME:
+            self._field = field or "author"
+            self._chunks = []
+        elif name == _LINK:
+            # The abstract page; the pdf and doi links are rel="related"
+            if attrs.get("rel", "alternate") == "alternate" and not entry["link"]:
+                entry["link"] = attrs.get("href", "")
+        elif name == _CATEGORY or name == _PRIMARY_CATEGORY:
+            term = attrs.get("term")
+            if term and term not in entry["categories"]:
+                if name == _PRIMARY_CATEGORY:
+                    entry["categories"].insert(0, term)
+                else:
+                    entry["categories"].append(term)
+
+    def _text(self, data: str) -> None:
+        if self._field is not None:
+            self._chunks.append(data)
+
+    def _end(self, name: str) -> None:
+        entry = self._entry
+        if entry is None:
+            return
+        if name == _ENTRY:
+            if not entry["link"]:
+                entry["link"] = entry.get("id", "")
+            entry.setdefault("published", entry.get("updated", ""))
+            self._ready.append(entry)
+            self._entry = None
+        elif self._field is not None:
+            text = "".join(self._chunks).strip()
+            if self._field == "author":
+                entry["authors"].append(text)
+            else:
+                entry[self._field] = text
+            self._field = None
+
+    def feed(self, data: Union[bytes, str], final: bool = False) -> List[Dict[str, Any]]:
+        """Parse the next chunk of the response; returns the entries it completed"""
+        self._parser.Parse(data, final)
+        ready, self._ready = self._ready, []
+        return ready
+
+    def close(self) -> List[Dict[str, Any]]:
+        return self.feed(b"", True)
+
+
+def parse_arxiv_feed(data: Union[bytes, str]) -> List[Dict[str, Any]]:
+    """Entry records of a complete arXiv API response; raises expat.ExpatError on malformed XML"""
+    return ArxivAtomParser().feed(data, True)
+
@@ -0,0 +1,158 @@
+"""
+Benchmark the streaming expat parser (atom_parser) against feedparser on arXiv API responses.
+
+Recorded responses are read from benchmarks/data/*.xml and are meant to be committed, so every
+run measures the same real payloads. Record cs.LG and cs.AI at 100 results with
+    python benchmarks/bench_arxiv_parser.py --record
+or pass other categories and --max-results. When no recordings exist, synthetic responses
+following the arXiv schema are used instead and the report says so.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import timeit
+from xml.sax.saxutils import escape
+
+import feedparser
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from atom_parser import parse_arxiv_feed  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+ARXIV_API = "http://export.arxiv.org/api/query"
+DEFAULT_CATEGORIES = ["cs.LG", "cs.AI"]
+
+
+def record(categories, max_results):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with httpx.Client(timeout=60) as client:
+        for i, category in enumerate(categories):
+            if i:
+                time.sleep(3)  # arXiv asks API clients to wait 3 seconds between requests
+            url = (f"{ARXIV_API}?search_query=cat:{category}&sortBy=submittedDate"
+                   f"&sortOrder=descending&start=0&max_results={max_results}")
+            response = client.get(url)
+            response.raise_for_status()
+            path = os.path.join(DATA_DIR, f"arxiv_{category}_{max_results}.xml")
+            with open(path, "wb") as f:
+                f.write(response.content)
+            print(f"recorded {path} ({len(response.content)} bytes)")
+
+
+def synthetic_payload(entries):
+    """An arXiv-shaped response: wrapped titles and abstracts, affiliations, doi and pdf links"""
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" '
+        'xmlns:arxiv="http://arxiv.org/schemas/atom">\n'
+        '  <link href="http://arxiv.org/api/query" rel="self" type="application/atom+xml"/>\n'
+        '  <title type="html">ArXiv Query: search_query=cat:cs.LG</title>\n'
+        f'  <opensearch:totalResults>{entries * 40}</opensearch:totalResults>\n'
+    ]
+    for i in range(entries):
+        paper = f"2401.{10000 + i:05d}"
+        abstract = " ".join(f"Sentence {j} of the abstract of paper {i} with $x^{j}$ & <math>." for j in range(12))
+        authors = "".join(
+            f"    <author>\n      <name>Author {i}-{j} Surname</name>\n"
+            f"      <arxiv:affiliation>University {j}</arxiv:affiliation>\n    </author>\n"
+            for j in range(1 + i % 6)
+        )
+        parts.append(
+            "  <entry>\n"
+            f"    <id>http://arxiv.org/abs/{paper}v{1 + i % 3}</id>\n"
+            f"    <updated>2024-01-{1 + i % 28:02d}T12:{i % 60:02d}:00Z</updated>\n"
+            f"    <published>2024-01-{1 + i % 28:02d}T11:{i % 60:02d}:00Z</published>\n"
+            f"    <title>A Study of Things Number {i}:\n  Wrapped Across Lines</title>\n"
+            f"    <summary>  {escape(abstract)}\n</summary>\n"
+            f"{authors}"
+            f"    <arxiv:doi>10.1000/{paper}</arxiv:doi>\n"
+            f'    <link title="doi" href="http://dx.doi.org/10.1000/{paper}" rel="related"/>\n'
+            f'    <link href="http://arxiv.org/abs/{paper}v1" rel="alternate" type="text/html"/>\n'
+            f'    <link title="pdf" href="http://arxiv.org/pdf/{paper}v1" rel="related" type="application/pdf"/>\n'
+            '    <arxiv:primary_category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>\n'
+            '    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>\n'
+            f'    <category term="{"stat.ML" if i % 2 else "cs.AI"}" scheme="http://arxiv.org/schemas/atom"/>\n'
+            "  </entry>\n"
+        )
+    parts.append("</feed>\n")
+    return "".join(parts).encode("utf-8")
+
+
+def load_payloads():
+    paths = sorted(glob.glob(os.path.join(DATA_DIR, "*.xml")))
+    if paths:
+        payloads = []
+        for path in paths:
+            with open(path, "rb") as f:
+                payloads.append((os.path.basename(path), f.read()))
+        return payloads, False
+    return [(f"synthetic-{n}", synthetic_payload(n)) for n in (10, 100, 500)], True
+
+
+def feedparser_records(body):
+    """What main.py extracted from feedparser before the expat parser replaced it"""
+    return [
+        {
+            "title": entry.get("title", ""),
+            "link": entry.get("link", ""),
+            "summary": entry.get("summary", ""),
+            "published": entry.get("published", entry.get("updated", "")),
+            "authors": [a.get("name", "") for a in entry.get("authors", [])],
+            "categories": [tag.get("term") for tag in entry.get("tags", [])],
+        }
+        for entry in feedparser.parse(body).entries
+    ]
+
+
+def compare(expected, actual):
+    """Field-by-field differences; category order is not significant"""
+    if len(expected) != len(actual):
+        return [f"{len(expected)} entries from feedparser, {len(actual)} from expat"]
+    differences = []
+    for i, (a, b) in enumerate(zip(expected, actual)):
+        for field in ("title", "link", "summary", "published", "authors"):
+            if a[field] != b[field]:
+                differences.append(f"entry {i} {field}: {a[field]!r} != {b[field]!r}")
+        if set(a["categories"]) != set(b["categories"]):
+            differences.append(f"entry {i} categories: {a['categories']} != {b['categories']}")
+    return differences
+
+
+def best_time(fn, repeat):
+    number = max(1, int(0.2 / max(timeit.timeit(fn, number=1), 1e-6)))
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--record", nargs="*", metavar="CATEGORY",
+                        help=f"record arXiv responses instead of benchmarking (default: {' '.join(DEFAULT_CATEGORIES)})")
+    parser.add_argument("--max-results", type=int, default=100, help="entries per recorded response")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions; the best is reported")
+    args = parser.parse_args()
+
+    if args.record is not None:
+        record(args.record or DEFAULT_CATEGORIES, args.max_results)
+        return
+
+    payloads, synthetic = load_payloads()
+    if synthetic:
+        print("No recordings in benchmarks/data; using synthetic arXiv-shaped responses.")
+        print("Run with --record to measure real arXiv payloads.\n")
+    print(f"{'payload':<32}{'entries':>8}{'KiB':>8}{'feedparser ms':>15}{'expat ms':>10}{'speedup':>9}")
+    for name, body in payloads:
+        text = body.decode("utf-8")
+        expected = feedparser_records(text)
+        differences = compare(expected, parse_arxiv_feed(body))
+        for difference in differences[:5]:
+            print(f"  mismatch in {name}: {difference}")
+        slow = best_time(lambda: feedparser_records(text), args.repeat)
+        fast = best_time(lambda: parse_arxiv_feed(body), args.repeat)
+        print(f"{name:<32}{len(expected):>8}{len(body) / 1024:>8.0f}{slow * 1000:>15.2f}{fast * 1000:>10.2f}{slow / fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,23 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-from sqlalchemy import create_engine, Column, String, ForeignKey, Index, DateTime, func
+from sqlalchemy import (
+    create_engine, Column, String, Text, Float, ForeignKey, Index, DateTime, func, and_, or_, select, delete,
+    literal, null, cast, union_all, true, inspect, text
+)
+from sqlalchemy.dialects import postgresql, sqlite, mysql
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker, declarative_base, relationship, Session
-from contextlib import contextmanager
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from contextlib import contextmanager, asynccontextmanager
+from dataclasses import dataclass
+from types import MappingProxyType
 import os
 import uuid
+import hashlib
 from datetime import datetime
-from typing import Generator, List, Optional, Dict, Any
+from timestamps import parse_published
+from typing import Generator, AsyncGenerator, List, Optional, Dict, Any, Tuple, Mapping, NamedTuple
 
 # =====================
 # Database Setup
@@ -26,6 +36,36 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# =====================
+# Async Database Setup
+# =====================
+def _async_database_url(url: str) -> str:
+    """Map a sync database URL onto the matching asyncio driver"""
+    scheme, _, rest = url.partition("://")
+    backend = scheme.split("+")[0]
+    if backend in ("postgres", "postgresql"):
+        # asyncpg spells libpq's sslmode as ssl
+        return "postgresql+asyncpg://" + rest.replace("sslmode=", "ssl=")
+    if backend == "sqlite":
+        return "sqlite+aiosqlite://" + rest
+    if backend == "mysql":
+        return "mysql+aiomysql://" + rest
+    return url
+
+# Async engine for request handlers, so queries don't block the event loop
+ASYNC_DATABASE_URL = os.environ.get("ASYNC_DATABASE_URL") or _async_database_url(DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=5,
+    max_overflow=10,
+    pool_recycle=3600,
+    echo=False
+)
+
+# Objects stay usable after commit, since routes read them once the session has closed
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create Base class for declarative models
 Base = declarative_base()
 
@@ -45,6 +85,17 @@ def get_db_session() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+@asynccontextmanager
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Async context manager for database sessions"""
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
 # =====================
 # FastAPI Dependency for Database Access
 # =====================
@@ -95,6 +146,68 @@ class User(Base):
         """Get a user by email"""
         return db.query(cls).filter(cls.email == email).first()
     
+    @classmethod
+    async def create_async(cls, db: AsyncSession, email: str) -> "User":
+        """Create a new user"""
+        user = cls(email=email)
+        db.add(user)
+        await db.commit()
+        return user
+    
+    @classmethod
+    async def get_by_email_async(cls, db: AsyncSession, email: str) -> Optional["User"]:
+        """Get a user by email"""
+        return await db.get(cls, email)
+    
+    @classmethod
+    def _search_filter(cls, search: Optional[str]):
+        if not search:
+            return true()
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return cls.email.ilike(f"%{escaped}%", escape="\\")
+    
+    @classmethod
+    async def count_async(cls, db: AsyncSession, search: Optional[str] = None) -> int:
+        """Count users, optionally only those whose email contains search"""
+        result = await db.execute(select(func.count()).select_from(cls).where(cls._search_filter(search)))
+        return result.scalar_one()
+    
+    @classmethod
+    async def page_with_favourite_counts_async(cls, db: AsyncSession, offset: int, limit: int,
+                                               search: Optional[str] = None) -> List[Dict[str, Any]]:
+        """One page of users, newest first, each with their number of favourites"""
+        result = await db.execute(
+            select(cls.email, cls.created_at)
+            .where(cls._search_filter(search))
+            .order_by(cls.created_at.desc(), cls.email)
+            .offset(offset)
+            .limit(limit)
+        )
+        rows = result.all()
+        emails = [row.email for row in rows]
+        counts = {}
+        if emails:
+            # Aggregate only this page's users rather than loading their favourites
+            count_result = await db.execute(
+                select(Favorite.user_email, func.count())
+                .where(Favorite.user_email.in_(emails))
+                .group_by(Favorite.user_email)
+            )
+            counts = dict(count_result.all())
+        return [
+            {"email": row.email, "created_at": row.created_at, "favourite_count": counts.get(row.email, 0)}
+            for row in rows
+        ]
+    
+    @classmethod
+    async def delete_with_data_async(cls, db: AsyncSession, email: str) -> None:
+        """Remove a user together with their favourites and category selections"""
+        await db.execute(delete(Favorite).where(Favorite.user_email == email))
+        await db.execute(delete(UserBookCategory).where(UserBookCategory.user_email == email))
+        await db.execute(delete(UserArxivTopic).where(UserArxivTopic.user_email == email))
+        await db.execute(delete(cls).where(cls.email == email))
+        await db.commit()
+    
     def get_arxiv_topics(self, db: Session) -> List[str]:
         """Get list of arxiv topic IDs for this user"""
         return [topic.arxiv_topic_id for topic in self.arxiv_topics]
@@ -128,6 +241,31 @@ class UserArxivTopic(Base):
             db.add(cls(user_email=user_email, arxiv_topic_id=topic_id))
         
         db.commit()
+    
+    @classmethod
+    async def add_topics_for_user_async(cls, db: AsyncSession, user_email: str, topic_ids: List[str]) -> None:
+        """Add multiple topics for a user, replacing existing ones"""
+        await db.execute(delete(cls).where(cls.user_email == user_email))
+        db.add_all([cls(user_email=user_email, arxiv_topic_id=topic_id) for topic_id in topic_ids])
+        await db.commit()
+    
+    @classmethod
+    async def get_topic_ids_async(cls, db: AsyncSession, user_email: str) -> List[str]:
+        """Get list of arxiv topic IDs for a user"""
+        result = await db.execute(select(cls.arxiv_topic_id).where(cls.user_email == user_email))
+        return list(result.scalars())
+    
+    @classmethod
+    def popular_topics(cls, db: Session) -> List[Tuple[str, int]]:
+        """Get (topic ID, subscriber count) pairs, most subscribed first"""
+        subscribers = func.count(cls.user_email)
+        return [
+            (topic_id, count)
+            for topic_id, count in db.query(cls.arxiv_topic_id, subscribers)
+            .group_by(cls.arxiv_topic_id)
+            .order_by(subscribers.desc())
+            .all()
+        ]
 
 
 class UserBookCategory(Base):
@@ -154,6 +292,31 @@ class UserBookCategory(Base):
             db.add(cls(user_email=user_email, book_category_id=cat_id))
         
         db.commit()
+    
+    @classmethod
+    async def add_categories_for_user_async(cls, db: AsyncSession, user_email: str, category_ids: List[str]) -> None:
+        """Add multiple categories for a user, replacing existing ones"""
+        await db.execute(delete(cls).where(cls.user_email == user_email))
+        db.add_all([cls(user_email=user_email, book_category_id=cat_id) for cat_id in category_ids])
+        await db.commit()
+    
+    @classmethod
+    async def get_category_ids_async(cls, db: AsyncSession, user_email: str) -> List[str]:
+        """Get list of book category IDs for a user"""
+        result = await db.execute(select(cls.book_category_id).where(cls.user_email == user_email))
+        return list(result.scalars())
+    
+    @classmethod
+    def popular_categories(cls, db: Session) -> List[Tuple[str, int]]:
+        """Get (category ID, subscriber count) pairs, most subscribed first"""
+        subscribers = func.count(cls.user_email)
+        return [
+            (category_id, count)
+            for category_id, count in db.query(cls.book_category_id, subscribers)
+            .group_by(cls.book_category_id)
+            .order_by(subscribers.desc())
+            .all()
+        ]
 
 
 class Favorite(Base, TimestampMixin):
@@ -164,41 +327,54 @@ class Favorite(Base, TimestampMixin):
     title = Column(String(500), nullable=False)
     type = Column(String(20), nullable=False)  # 'arxiv' or 'book'
     link = Column(String(1000), nullable=False)
+    # sha256 of link; the unique key a favourite is deduplicated on
+    link_hash = Column(String(64), nullable=False)
     date_published = Column(String(30))
     
     # Define relationship back to user
     user = relationship("User", back_populates="favorites")
     
+    __table_args__ = (
+        Index("uq_favourites_user_link_hash", "user_email", "link_hash", unique=True),
+    )
+    
     def __repr__(self):
         return f"<Favorite {self.id}: {self.title[:30]}...>"
     
+    @staticmethod
+    def compute_link_hash(link: str) -> str:
+        return hashlib.sha256(link.encode("utf-8")).hexdigest()
+    
     @classmethod
-    def add_favorite(cls, db: Session, user_email: str, title: str, 
-                    type_: str, link: str, date_published: str) -> "Favorite":
-        """Add a favorite for a user"""
-        # Check if already exists
-        existing = db.query(cls).filter(
-            cls.user_email == user_email,
-            cls.title == title,
-            cls.link == link
-        ).first()
-        
-        if existing:
-            return existing
-            
-        # Create new favorite
-        favorite = cls(
-            user_email=user_email,
-            title=title,
-            type=type_,
-            link=link,
-            date_published=date_published
-        )
-        
-        db.add(favorite)
-        db.commit()
-        db.refresh(favorite)
-        return favorite
+    def _upsert_statement(cls, dialect_name: str, values: Dict[str, Any]):
+        """
+        INSERT that leaves an existing (user_email, link_hash) row untouched.
+        On PostgreSQL and SQLite the no-op DO UPDATE makes RETURNING yield the id of
+        whichever row now holds the key; MySQL has no RETURNING, so it returns None.
+        """
+        if dialect_name in ("postgresql", "sqlite"):
+            dialect = postgresql if dialect_name == "postgresql" else sqlite
+            stmt = dialect.insert(cls).values(**values)
+            return stmt.on_conflict_do_update(
+                index_elements=[cls.user_email, cls.link_hash],
+                set_={"link_hash": stmt.excluded.link_hash},
+            ).returning(cls.id)
+        if dialect_name == "mysql":
+            stmt = mysql.insert(cls).values(**values)
+            return stmt.on_duplicate_key_update(link_hash=stmt.inserted.link_hash)
+        return None
+    
+    @classmethod
+    def _upsert_values(cls, user_email: str, title: str, type_: str, link: str, date_published: str) -> Dict[str, Any]:
+        return {
+            "id": str(uuid.uuid4()),
+            "user_email": user_email,
+            "title": title,
+            "type": type_,
+            "link": link,
+            "link_hash": cls.compute_link_hash(link),
+            "date_published": date_published,
+        }
     
     @classmethod
     def remove_favorite(cls, db: Session, fav_id: str, user_email: str) -> bool:
@@ -210,11 +386,340 @@ class Favorite(Base, TimestampMixin):
         
         db.commit()
         return result > 0
+    
+    @classmethod
+    async def add_favorite_async(cls, db: AsyncSession, user_email: str, title: str,
+                                 type_: str, link: str, date_published: str) -> Tuple[str, bool]:
+        """Add a favorite for a user with a single upsert; returns (id, created)"""
+        values = cls._upsert_values(user_email, title, type_, link, date_published)
+        stmt = cls._upsert_statement(db.get_bind().dialect.name, values)
+        fav_id = None
+        if stmt is not None:
+            # MySQL's ON DUPLICATE KEY UPDATE has no RETURNING; the id is looked up below
+            if stmt.returning_column_descriptions:
+                fav_id = (await db.execute(stmt)).scalar()
+            else:
+                await db.execute(stmt)
+        else:
+            try:
+                await db.execute(cls.__table__.insert().values(**values))
+                fav_id = values["id"]
+            except IntegrityError:
+                await db.rollback()
+        if fav_id is None:
+            fav_id = (await db.execute(
+                select(cls.id).where(cls.user_email == user_email, cls.link_hash == values["link_hash"])
+            )).scalar_one()
+        await db.commit()
+        return fav_id, fav_id == values["id"]
+    
+    @classmethod
+    async def remove_favorite_async(cls, db: AsyncSession, fav_id: str, user_email: str) -> bool:
+        """Remove a favorite for a user"""
+        result = await db.execute(delete(cls).where(cls.id == fav_id, cls.user_email == user_email))
+        await db.commit()
+        return result.rowcount > 0
+    
+    @classmethod
+    async def get_for_user_async(cls, db: AsyncSession, user_email: str) -> List["Favorite"]:
+        """Get all favorites of a user"""
+        result = await db.execute(select(cls).where(cls.user_email == user_email))
+        return list(result.scalars())
+
+
+class FeedItem(Base, TimestampMixin):
+    __tablename__ = "feed_items"
+    
+    # An item is stored once per category it was ingested under
+    item_hash = Column(String(64), primary_key=True)
+    # Shared by every version and edition of the same work; feeds show one item per work
+    work_hash = Column(String(64))
+    category = Column(String(50), primary_key=True)
+    type = Column(String(20), nullable=False)  # 'arxiv' or 'book'
+    title = Column(Text, nullable=False)
+    link = Column(String(1000), nullable=False)
+    summary = Column(Text)
+    authors = Column(Text)
+    thumbnail = Column(String(1000))
+    published = Column(String(30))
+    published_ts = Column(Float)  # published as epoch seconds, the sort key
+    content_hash = Column(String(64), nullable=False)
+    
+    __table_args__ = (
+        Index("ix_feed_items_category_published_ts", "category", "published_ts"),
+    )
+    
+    def __repr__(self):
+        return f"<FeedItem {self.category}: {self.title[:30]}...>"
+    
+    @staticmethod
+    def compute_hash(type_: str, link: str) -> str:
+        """Stable identity of an upstream item, from its link or canonical identifier"""
+        return hashlib.sha256(f"{type_}:{link}".encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def compute_content_hash(item: Dict[str, Any]) -> str:
+        """Fingerprint of the displayed fields, used to detect changed entries"""
+        fields = [item.get(k) or '' for k in ('title', 'summary', 'authors', 'thumbnail', 'published')]
+        return hashlib.sha256("\x1f".join(fields).encode("utf-8")).hexdigest()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the dict format produced by the feed fetchers"""
+        item = {
+            'title': self.title,
+            'link': self.link,
+            'summary': self.summary or '',
+            'published': self.published or '',
+            'published_ts': self.published_ts or 0.0,
+            'item_hash': self.item_hash,
+            'work_hash': self.work_hash or self.item_hash,
+            'type': self.type,
+            'category': self.category,
+            'authors': self.authors or '',
+        }
+        if self.type == 'book':
+            item['thumbnail'] = self.thumbnail or ''
+        item['content_hash'] = self.content_hash
+        return item
+    
+    @classmethod
+    def upsert_items(cls, db: Session, items: List[Dict[str, Any]]) -> int:
+        """Insert new items and update changed ones; returns the number of rows written"""
+        rows = {}
+        for item in items:
+            item_hash = item.get('item_hash') or cls.compute_hash(item['type'], item['link'])
+            rows[(item_hash, item['category'])] = (item, cls.compute_content_hash(item), item.get('work_hash') or item_hash)
+        if not rows:
+            return 0
+        
+        existing = {
+            (row.item_hash, row.category): row
+            for row in db.query(cls).filter(cls.item_hash.in_(list({h for h, _ in rows})))
+        }
+        written = 0
+        for key, (item, content_hash, work_hash) in rows.items():
+            row = existing.get(key)
+            if row is not None and row.content_hash == content_hash and row.work_hash == work_hash:
+                continue
+            if row is None:
+                row = cls(item_hash=key[0], category=key[1], type=item['type'])
+                db.add(row)
+            row.title = item.get('title', '')
+            row.link = item['link']
+            row.summary = item.get('summary', '')
+            row.authors = item.get('authors', '')
+            row.thumbnail = item.get('thumbnail', '')
+            row.published = (item.get('published') or '')[:30]
+            row.published_ts = item.get('published_ts', parse_published(row.published))
+            row.content_hash = content_hash
+            row.work_hash = work_hash
+            written += 1
+        
+        db.commit()
+        return written
+    
+    @classmethod
+    def latest_for_category(cls, db: Session, type_: str, category: str, limit: int) -> List["FeedItem"]:
+        """Get the newest stored items of one category"""
+        return (
+            db.query(cls)
+            .filter(cls.category == category, cls.type == type_)
+            .order_by(cls.published_ts.desc(), cls.item_hash.desc())
+            .limit(limit)
+            .all()
+        )
+    
+    @staticmethod
+    def age_seconds(db: Session, rows: List["FeedItem"]) -> float:
+        """
+        Seconds since the newest of rows was written. updated_at is stamped by the database clock,
+        so it is only compared with that clock and never with the application's.
+        """
+        now = db.execute(select(func.now())).scalar_one()
+        newest = max(row.updated_at for row in rows)
+        # now() may come back timezone-aware while the column is naive; both are the database's wall time
+        return max((now.replace(tzinfo=None) - newest.replace(tzinfo=None)).total_seconds(), 0.0)
+    
+    @classmethod
+    def recently_updated(cls, db: Session, limit: int, offset: int = 0) -> List["FeedItem"]:
+        """Get the most recently ingested items across all categories"""
+        return (
+            db.query(cls)
+            .order_by(cls.updated_at.desc(), cls.item_hash, cls.category)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+    
+    @classmethod
+    def get_by_hashes(cls, db: Session, item_hashes: List[str]) -> Dict[str, "FeedItem"]:
+        """Get one stored row per item hash, whichever category it was stored under"""
+        if not item_hashes:
+            return {}
+        return {row.item_hash: row for row in db.query(cls).filter(cls.item_hash.in_(item_hashes))}
+    
+    @classmethod
+    def recent_identities(cls, db: Session, limit: int) -> List[Any]:
+        """Identity columns of the most recently ingested items, without their text"""
+        return (
+            db.query(cls.item_hash, cls.work_hash, cls.type, cls.title, cls.authors, cls.link)
+            .order_by(cls.updated_at.desc())
+            .limit(limit)
+            .all()
+        )
+    
+    @classmethod
+    def latest_for_categories(cls, db: Session, book_categories: List[str], 
+                              arxiv_topics: List[str], limit: int) -> List["FeedItem"]:
+        """Get the newest stored items across a user's categories in one indexed query"""
+        conditions = []
+        if book_categories:
+            conditions.append(and_(cls.type == 'book', cls.category.in_(book_categories)))
+        if arxiv_topics:
+            conditions.append(and_(cls.type == 'arxiv', cls.category.in_(arxiv_topics)))
+        if not conditions:
+            return []
+        return (
+            db.query(cls)
+            .filter(or_(*conditions))
+            .order_by(cls.published_ts.desc(), cls.item_hash.desc())
+            .limit(limit)
+            .all()
+        )
+
+
+# =====================
+# Admin Statistics
+# =====================
+async def load_admin_summary(db: AsyncSession, top_n: int = 10) -> Dict[str, Any]:
+    """Totals and most popular categories, computed with aggregate queries"""
+    user_count = (await db.execute(select(func.count()).select_from(User))).scalar_one()
+    favourite_count = (await db.execute(select(func.count()).select_from(Favorite))).scalar_one()
+    
+    book_subscribers = func.count(UserBookCategory.user_email)
+    popular_books = await db.execute(
+        select(UserBookCategory.book_category_id, book_subscribers)
+        .group_by(UserBookCategory.book_category_id)
+        .order_by(book_subscribers.desc())
+        .limit(top_n)
+    )
+    topic_subscribers = func.count(UserArxivTopic.user_email)
+    popular_topics = await db.execute(
+        select(UserArxivTopic.arxiv_topic_id, topic_subscribers)
+        .group_by(UserArxivTopic.arxiv_topic_id)
+        .order_by(topic_subscribers.desc())
+        .limit(top_n)
+    )
+    return {
+        "users": user_count,
+        "favourites": favourite_count,
+        "popular_book_categories": [tuple(row) for row in popular_books.all()],
+        "popular_arxiv_topics": [tuple(row) for row in popular_topics.all()],
+    }
+
+
+# =====================
+# User Context Loader
+# =====================
+class FavouriteEntry(NamedTuple):
+    id: str
+    title: str
+    type: str
+    link: str
+    date_published: Optional[str]
+
+
+@dataclass(frozen=True)
+class UserContext:
+    """Everything the feed pages need about a user, loaded in one round trip"""
+    email: str
+    exists: bool
+    book_categories: Tuple[str, ...]
+    arxiv_topics: Tuple[str, ...]
+    favourites: Tuple[FavouriteEntry, ...]
+    # link -> favourite id; favourites are unique per link, so that is what the feed routes match items on
+    favourite_ids: Mapping[str, str]
+
+
+async def load_user_context(db: AsyncSession, email: str) -> UserContext:
+    """
+    Load a user's categories, topics and favourites with a single UNION ALL query,
+    instead of one query per relationship.
+    """
+    def columns(kind: str, *values):
+        padded = list(values) + [cast(null(), String)] * (5 - len(values))
+        return [literal(kind).label("kind")] + [v.label(f"c{i}") for i, v in enumerate(padded)]
+    
+    stmt = union_all(
+        select(*columns("user", User.email)).where(User.email == email),
+        select(*columns("book", UserBookCategory.book_category_id)).where(UserBookCategory.user_email == email),
+        select(*columns("arxiv", UserArxivTopic.arxiv_topic_id)).where(UserArxivTopic.user_email == email),
+        select(*columns("fav", Favorite.id, Favorite.title, Favorite.type, Favorite.link, Favorite.date_published))
+        .where(Favorite.user_email == email),
+    )
+    exists = False
+    book_categories, arxiv_topics, favourites = [], [], []
+    for row in await db.execute(stmt):
+        if row.kind == "user":
+            exists = True
+        elif row.kind == "book":
+            book_categories.append(row.c0)
+        elif row.kind == "arxiv":
+            arxiv_topics.append(row.c0)
+        else:
+            favourites.append(FavouriteEntry(row.c0, row.c1, row.c2, row.c3, row.c4))
+    return UserContext(
+        email=email,
+        exists=exists,
+        book_categories=tuple(book_categories),
+        arxiv_topics=tuple(arxiv_topics),
+        favourites=tuple(favourites),
+        favourite_ids=MappingProxyType({fav.link: fav.id for fav in favourites}),
+    )
 
 
 # Create tables
 Base.metadata.create_all(bind=engine)
 
+# =====================
+# Schema Migrations
+# =====================
+def _migrate_favourites_link_hash() -> None:
+    """
+    Add favourites.link_hash to databases created before it existed: backfill the hashes,
+    drop duplicate favourites (keeping the oldest) and create the unique index.
+    """
+    if "link_hash" in {col["name"] for col in inspect(engine).get_columns("favourites")}:
+        return
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE favourites ADD COLUMN link_hash VARCHAR(64)"))
+        rows = conn.execute(
+            select(Favorite.id, Favorite.user_email, Favorite.link)
+            .order_by(Favorite.created_at, Favorite.id)
+        ).all()
+        seen = set()
+        duplicates = []
+        duplicates_by_user: Dict[str, int] = {}
+        for row in rows:
+            link_hash = Favorite.compute_link_hash(row.link)
+            if (row.user_email, link_hash) in seen:
+                duplicates.append(row.id)
+                duplicates_by_user[row.user_email] = duplicates_by_user.get(row.user_email, 0) + 1
+                continue
+            seen.add((row.user_email, link_hash))
+            conn.execute(
+                Favorite.__table__.update().where(Favorite.id == row.id).values(link_hash=link_hash)
+            )
+        if duplicates:
+            conn.execute(delete(Favorite).where(Favorite.id.in_(duplicates)))
+            per_user = ", ".join(f"{email}: {count}" for email, count in sorted(duplicates_by_user.items()))
+            print(f"favourites.link_hash migration removed {len(duplicates)} duplicate favourites ({per_user})")
+        for index in Favorite.__table__.indexes:
+            if index.name == "uq_favourites_user_link_hash":
+                index.create(conn, checkfirst=True)
+
+_migrate_favourites_link_hash()
+
 # =====================
 # Legacy Support (for backward compatibility with your existing code)
 # =====================
@@ -224,3 +729,4 @@ users = User.__table__
 user_arxiv_topics = UserArxivTopic.__table__
 user_book_categories = UserBookCategory.__table__
 favourites = Favorite.__table__
+feed_items = FeedItem.__table__
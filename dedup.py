@@ -0,0 +1,214 @@
+import random
+import re
+import unicodedata
+import zlib
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from lru_cache import LRUCache
+
+# =====================
+# Canonical Identifiers
+# =====================
+# New-style (2401.07219v2) and old-style (hep-th/9901001v1) arXiv identifiers
+_ARXIV_ID_RE = re.compile(r"arxiv\.org/(?:abs|pdf)/((?:\d{4}\.\d{4,5})|(?:[a-z\-]+(?:\.[A-Z]{2})?/\d{7}))(?:v\d+)?", re.I)
+
+
+def arxiv_id(link: Optional[str]) -> Optional[str]:
+    """arXiv identifier of a paper link without its version suffix, so v1 and v2 compare equal"""
+    match = _ARXIV_ID_RE.search(link or "")
+    return match.group(1).lower() if match else None
+
+
+def normalize_isbn(value: Optional[str]) -> Optional[str]:
+    """ISBN-13 form of an ISBN-10 or ISBN-13, or None if it isn't a valid one"""
+    digits = re.sub(r"[^0-9Xx]", "", value or "").upper()
+    if len(digits) == 13 and digits.isdigit():
+        return digits
+    if len(digits) == 10 and digits[:9].isdigit():
+        core = "978" + digits[:9]
+        check = (10 - sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(core)) % 10) % 10
+        return core + str(check)
+    return None
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """Accent-free lowercase title with punctuation and extra whitespace removed"""
+    text = unicodedata.normalize("NFKD", title or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return " ".join(re.sub(r"[^\w\s]", " ", text).split())
+
+
+# Roman numerals up to 39, which covers volumes and parts; ordinary words like "civil" or "ill" don't match
+_ROMAN_RE = re.compile(r"^x{0,3}(?:ix|iv|v?i{0,3})$")
+_NUMBERING_MARKERS = frozenset({"volume", "vol", "part", "pt", "book", "edition", "ed", "no", "number", "tome", "series"})
+
+
+def title_numbering(title: str) -> frozenset:
+    """
+    Numbers in a normalized title; "Part I" and "Part II" are different works. Digits count
+    anywhere, roman numerals only after a marker such as "volume" or "part", or as the last word.
+    """
+    words = title.split()
+    numbering = set()
+    for i, word in enumerate(words):
+        if word.isdigit():
+            numbering.add(word)
+        elif word and _ROMAN_RE.match(word) and (i == len(words) - 1 or (i > 0 and words[i - 1] in _NUMBERING_MARKERS)):
+            numbering.add(word)
+    return frozenset(numbering)
+
+
+def author_surnames(authors: Optional[str]) -> Set[str]:
+    """Last name of each author in a comma-separated author list"""
+    names = set()
+    for author in (authors or "").split(","):
+        parts = normalize_title(author).split()
+        if parts:
+            names.add(parts[-1])
+    return names
+
+# =====================
+# MinHash Signatures
+# =====================
+class MinHasher:
+    """MinHash signatures over character shingles, split into LSH bands"""
+    _PRIME = (1 << 61) - 1
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, shingle_size: int = 3, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, self._PRIME), rng.randrange(0, self._PRIME)) for _ in range(num_perm)]
+
+    def shingles(self, text: str) -> Set[int]:
+        padded = f" {text} "
+        k = self.shingle_size
+        if len(padded) <= k:
+            return {zlib.crc32(padded.encode("utf-8"))}
+        return {zlib.crc32(padded[i:i + k].encode("utf-8")) for i in range(len(padded) - k + 1)}
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        shingles = self.shingles(text)
+        return tuple(min((a * s + b) % self._PRIME for s in shingles) for a, b in self._perms)
+
+    def band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    @staticmethod
+    def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+# =====================
+# Near-Duplicate Detection
+# =====================
+class Deduplicator:
+    """
+    Gives every item a deterministic item_hash from its canonical identifier (versionless arXiv
+    ID, ISBN-13, or link), and the work_hash of the work it represents. Books and unidentified
+    papers whose normalized titles are near-duplicates by MinHash/LSH, with the same numbering
+    and a shared author, join the work of the first such item seen. Items read back from
+    storage keep their stored work_hash, so work membership survives restarts. Feeds and search
+    treat items of a work as one.
+    Remembers at most max_items works.
+    """
+    def __init__(self, hash_item: Callable[[str, str], str], threshold: float = 0.8,
+                 max_items: int = 50000, hasher: Optional[MinHasher] = None):
+        self.hash_item = hash_item
+        self.threshold = threshold
+        self.hasher = hasher or MinHasher()
+        # representative hash -> (type, signature, author surnames, title numbering)
+        self._works = LRUCache(max_entries=max_items, on_evict=self._unindex_work)
+        # (type, band) -> representative hashes sharing that band
+        self._buckets: Dict[Tuple[str, Hashable], Set[str]] = {}
+        # canonical hash -> representative hash
+        self._aliases = LRUCache(max_entries=max_items)
+        self.collapsed = 0
+
+    def _unindex_work(self, rep: str, work) -> None:
+        type_, signature, _, _ = work
+        for band in self.hasher.band_keys(signature):
+            bucket = self._buckets.get((type_, band))
+            if bucket is not None:
+                bucket.discard(rep)
+                if not bucket:
+                    del self._buckets[(type_, band)]
+
+    def canonical_hash(self, item: Dict[str, Any]) -> Tuple[str, bool]:
+        """Hash of the item's canonical identifier, and whether that identifier alone is authoritative"""
+        if item.get('isbn'):
+            # Editions of a book get different ISBNs, so these still go through title matching
+            return self.hash_item(item['type'], f"isbn:{item['isbn']}"), False
+        if item['type'] == 'arxiv':
+            paper_id = arxiv_id(item.get('link'))
+            if paper_id:
+                return self.hash_item('arxiv', f"arxiv:{paper_id}"), True
+        return item.get('item_hash') or self.hash_item(item['type'], item.get('link', '')), False
+
+    def identify(self, item: Dict[str, Any]) -> str:
+        """Work hash of the work item belongs to, registering it if it is new"""
+        canonical, authoritative = self.canonical_hash(item)
+        rep = self._aliases.get(canonical)
+        if rep is not None:
+            return rep
+        title = normalize_title(item.get('title'))
+        rep = item.get('work_hash') or canonical
+        if title and not authoritative:
+            signature = self.hasher.signature(title)
+            work = (item['type'], signature, author_surnames(item.get('authors')), title_numbering(title))
+            bands = self.hasher.band_keys(signature)
+            # A stored work_hash is authoritative; only new items are matched by title
+            match = None if item.get('work_hash') else self._find_match(work, bands)
+            if match is not None:
+                rep = match
+            elif rep not in self._works:
+                self._works.set(rep, work, size=0)
+                for band in bands:
+                    self._buckets.setdefault((item['type'], band), set()).add(rep)
+        self._aliases.set(canonical, rep, size=0)
+        return rep
+
+    def _find_match(self, work, bands) -> Optional[str]:
+        type_, signature, surnames, numbering = work
+        candidates = set()
+        for band in bands:
+            candidates |= self._buckets.get((type_, band), set())
+        for candidate in candidates:
+            other = self._works.peek(candidate)
+            if other is None:
+                continue
+            _, other_signature, other_surnames, other_numbering = other
+            # Short generic titles ("Poems") collide easily, so a shared author is required too;
+            # items without authors are never merged on title alone
+            if not surnames & other_surnames:
+                continue
+            if numbering != other_numbering:
+                continue
+            if self.hasher.similarity(signature, other_signature) >= self.threshold:
+                return candidate
+        return None
+
+    def collapse(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Give a fetched or stored list its item and work identities in place and keep only the
+        newest item of each work
+        """
+        kept = []
+        seen = set()
+        for item in sorted(items, key=lambda item: item.get('published_ts', 0.0), reverse=True):
+            rep = self.identify(item)
+            if rep in seen:
+                self.collapsed += 1
+                continue
+            seen.add(rep)
+            item['item_hash'] = self.canonical_hash(item)[0]
+            item['work_hash'] = rep
+            kept.append(item)
+        return kept
+
+    def stats(self) -> Dict[str, Any]:
+        return {"works": len(self._works), "aliases": len(self._aliases), "collapsed": self.collapsed}
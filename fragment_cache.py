@@ -0,0 +1,83 @@
+import hashlib
+import re
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from jinja2 import Environment, Template, meta
+from markupsafe import Markup
+
+from lru_cache import LRUCache
+
+# =====================
+# Rendered Fragment Cache
+# =====================
+_SLOT_RE = re.compile("\x00([a-z_]+)\x00")
+
+
+class FragmentCache:
+    """
+    Rendered HTML of template fragments, e.g. one feed item, stored once per key and template
+    version. Per-request values (favourite state, position) are left as named slots: the fragment
+    is rendered with `slot.<name>` set to a marker, split at the markers, and each request only
+    joins the cached pieces with its own, already escaped, slot values.
+    """
+    def __init__(self, env: Environment, slots: Iterable[str], max_entries: int = 20000,
+                 max_bytes: Optional[int] = None):
+        self.env = env
+        self.slots = {name: f"\x00{name}\x00" for name in slots}
+        self._fragments = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+        # template name -> (template, source hash, templates it extends or includes);
+        # a reloaded template gets a new version
+        self._versions: Dict[str, Tuple[Template, str, Tuple[str, ...]]] = {}
+
+    def _template(self, name: str) -> Tuple[Template, str]:
+        template = self.env.get_template(name)
+        known = self._versions.get(name)
+        if known is None or known[0] is not template:
+            source, _, _ = self.env.loader.get_source(self.env, name)
+            referenced = tuple(sorted(n for n in meta.find_referenced_templates(self.env.parse(source)) if n))
+            known = (template, hashlib.sha256(source.encode("utf-8")).hexdigest()[:16], referenced)
+            self._versions[name] = known
+        template, version, referenced = known
+        if referenced:
+            # A parent or included template can be reloaded on its own
+            combined = "/".join([version] + [self._template(n)[1] for n in referenced])
+            version = hashlib.sha256(combined.encode("utf-8")).hexdigest()[:16]
+        return template, version
+
+    def version(self, name: str) -> str:
+        """Hash of a template's source and of every template it extends or includes"""
+        return self._template(name)[1]
+
+    def _compile(self, template: Template, context: Dict[str, Any]) -> Tuple[str, ...]:
+        """Rendered fragment as literal text at even indexes and slot names at odd ones"""
+        return tuple(_SLOT_RE.split(template.render(context, slot=self.slots)))
+
+    def render(self, name: str, items: List[Dict[str, Any]], key: Callable[[Dict[str, Any]], Hashable],
+               overlay: Callable[[Dict[str, Any], int], Dict[str, str]], var: str = "item") -> Markup:
+        """
+        Concatenated fragments of name for items. key gives an item's cache key, or None to render
+        it uncached; overlay gives the slot values for an item at a 1-based position.
+        """
+        template, version = self._template(name)
+        out = []
+        for position, item in enumerate(items, 1):
+            item_key = key(item)
+            if item_key is not None:
+                cache_key = (name, version, item_key)
+                parts = self._fragments.get(cache_key)
+                if parts is None:
+                    parts = self._compile(template, {var: item})
+                    self._fragments.set(cache_key, parts, size=sum(len(p) for p in parts))
+            else:
+                parts = self._compile(template, {var: item})
+            values = overlay(item, position)
+            for i, part in enumerate(parts):
+                out.append(values[part] if i % 2 else part)
+        return Markup("".join(out))
+
+    def clear(self) -> None:
+        self._fragments.clear()
+        self._versions.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._fragments.stats()
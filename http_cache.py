@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Dict, Optional, Any
+
+# =====================
+# Persistent HTTP Response Cache
+# =====================
+class HttpResponseCache:
+    """
+    On-disk store of upstream response validators (ETag / Last-Modified) and bodies,
+    keyed by URL, so conditional requests keep working across restarts.
+    Validators and bodies are kept in separate files so a refresh only reads the small one.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str, suffix: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.{suffix}")
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def load_validators(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get the stored validators for a URL, or None if it was never cached"""
+        try:
+            with open(self._path(url, "meta.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load_body(self, url: str) -> Optional[bytes]:
+        """Get the stored raw response body for a URL"""
+        try:
+            with open(self._path(url, "body"), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str], body: bytes) -> None:
+        """Save a response; the body is written before its validators so they never point at a missing body"""
+        self._write_atomic(self._path(url, "body"), body)
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time(),
+        }
+        self._write_atomic(self._path(url, "meta.json"), json.dumps(meta).encode("utf-8"))
+
+    def touch(self, url: str) -> None:
+        """Mark a cached response as still in use after a 304, so pruning keeps it"""
+        try:
+            os.utime(self._path(url, "meta.json"))
+        except OSError:
+            pass
+
+    def prune(self, max_age: float) -> int:
+        """
+        Delete responses not stored or revalidated within max_age seconds, along with bodies
+        whose validators are gone and leftover temp files; returns the number of files removed
+        """
+        cutoff = time.time() - max_age
+        removed = 0
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return 0
+        expired = set()
+        for entry in entries:
+            if entry.name.endswith(".meta.json"):
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        expired.add(entry.name[:-len(".meta.json")])
+                except OSError:
+                    pass
+        live = {entry.name[:-len(".meta.json")] for entry in entries if entry.name.endswith(".meta.json")} - expired
+        for entry in entries:
+            digest = entry.name.split(".", 1)[0]
+            if digest in live:
+                continue
+            try:
+                # Bodies without validators may be mid-store, so only old ones go
+                if digest in expired or entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    removed += 1
+            except OSError:
+                pass
+        return removed
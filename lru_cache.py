@@ -0,0 +1,161 @@
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# =====================
+# Size Estimation
+# =====================
+def estimate_size(value: Any) -> int:
+    """Approximate memory footprint in bytes of nested lists, tuples, dicts and scalars"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k) + estimate_size(v)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for v in value:
+            size += estimate_size(v)
+    return size
+
+# =====================
+# Bounded LRU / TTL Cache
+# =====================
+class CacheEntry:
+    __slots__ = ("value", "stored_at", "size")
+
+    def __init__(self, value: Any, stored_at: datetime, size: int):
+        self.value = value
+        self.stored_at = stored_at
+        self.size = size
+
+
+class LRUCache:
+    """
+    Mapping with a maximum entry count, an approximate byte budget and a hard maximum age.
+    Least recently used entries are evicted first; entries older than max_age are dropped
+    on access and by periodic sweeps. Freshness (TTL) is left to the caller, which can
+    keep serving an entry after its TTL until max_age removes it.
+    """
+    def __init__(self, max_entries: int, max_bytes: Optional[int] = None, max_age: Optional[float] = None,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None, sweep_interval: float = 60.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.on_evict = on_evict
+        self.sweep_interval = sweep_interval
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._last_sweep = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._expired(entry, datetime.now())
+
+    def _expired(self, entry: CacheEntry, now: datetime) -> bool:
+        return self.max_age is not None and (now - entry.stored_at).total_seconds() >= self.max_age
+
+    def _remove(self, key: Hashable) -> CacheEntry:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        if self.on_evict is not None:
+            self.on_evict(key, entry.value)
+        return entry
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value and mark it recently used; counts towards hit/miss statistics"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        if self._expired(entry, datetime.now()):
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value without touching LRU order or statistics"""
+        entry = self._entries.get(key)
+        if entry is None or self._expired(entry, datetime.now()):
+            return default
+        return entry.value
+
+    def stored_at(self, key: Hashable) -> Optional[datetime]:
+        """When the value for key was stored or last touched, or None if absent"""
+        entry = self._entries.get(key)
+        if entry is None or self._expired(entry, datetime.now()):
+            return None
+        return entry.stored_at
+
+    def set(self, key: Hashable, value: Any, stored_at: Optional[datetime] = None, size: Optional[int] = None) -> None:
+        """Store a value, evicting least recently used entries to stay within the bounds"""
+        if key in self._entries:
+            self._remove(key)
+        if size is None:
+            size = estimate_size(value)
+        self._entries[key] = CacheEntry(value, stored_at or datetime.now(), size)
+        self._bytes += size
+        if time.monotonic() - self._last_sweep >= self.sweep_interval:
+            self.purge_expired()
+        while self._entries and (
+            len(self._entries) > self.max_entries or
+            (self.max_bytes is not None and self._bytes > self.max_bytes and len(self._entries) > 1)
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def touch(self, key: Hashable, stored_at: Optional[datetime] = None) -> None:
+        """Extend the lifetime of an entry without replacing its value"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.stored_at = stored_at or datetime.now()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self._entries:
+            return default
+        return self._remove(key).value
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self._remove(key)
+
+    def keys(self):
+        return list(self._entries.keys())
+
+    def purge_expired(self) -> int:
+        """Drop every entry past max_age; returns how many were removed"""
+        self._last_sweep = time.monotonic()
+        if self.max_age is None:
+            return 0
+        now = datetime.now()
+        expired = [key for key, entry in self._entries.items() if self._expired(entry, now)]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
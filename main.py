@@ -1,29 +1,60 @@
 from fastapi import FastAPI, Request, Depends, Form, HTTPException, status, BackgroundTasks
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, StreamingResponse, Response
+from fastapi.encoders import jsonable_encoder
 from starlette.middleware.sessions import SessionMiddleware
 from fastapi.templating import Jinja2Templates
 import httpx
 from pydantic_settings import BaseSettings
 import logging
-from jose import jwt
+from jose import jwt, jwk
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager, nullcontext
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Set, Mapping, AsyncIterator, Callable, Union
+from urllib.parse import urlsplit
+import importlib.util
+import base64
+import gzip
+import hashlib
+import binascii
+import json
+import sys
 import feedparser
 import asyncio
-import requests
+import heapq
+import math
+import re
+import time
 
 # Import both legacy table references and new ORM models
 from database import (
     # Legacy table references for compatibility
     SessionLocal, users, user_arxiv_topics, user_book_categories, favourites,
     # Session management
-    get_db, get_db_session,
+    get_db, get_db_session, get_async_db_session, async_engine,
     # ORM models
-    User, UserArxivTopic, UserBookCategory, Favorite
+    User, UserArxivTopic, UserBookCategory, Favorite, FeedItem,
+    # Per-request user data
+    UserContext, load_user_context, load_admin_summary
 )
-from constants import BOOK_CATEGORIES, ARXIV_TAXONOMY
+import taxonomy
+from http_cache import HttpResponseCache
+from lru_cache import LRUCache
+from fragment_cache import FragmentCache
+from static_assets import AssetManifest, FingerprintedStaticFiles, preferred_encoding
+from markupsafe import Markup, escape
+from pubsub import PubSub
+from search_index import SearchIndex
+from dedup import Deduplicator, normalize_isbn
+from atom_parser import parse_arxiv_feed
+from xml.parsers.expat import ExpatError
+
+try:
+    import brotli
+except ImportError:  # Optional; responses fall back to gzip without it
+    brotli = None
+from timestamps import parse_published
 
 # =====================
 # Environment Settings
@@ -35,6 +66,47 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     BASE_URL: str = "http://localhost:8000"  # Default for local, override in Render
     RSS_CACHE_TTL: int = 1800  # 30 minutes cache for RSS feeds
+    RSS_CACHE_MAX_STALE: int = 86400  # Stale category entries are dropped after this many seconds
+    RSS_CACHE_MAX_ENTRIES: int = 2000  # Cached per-user feeds
+    RSS_CATEGORY_CACHE_MAX_ENTRIES: int = 2000  # Cached upstream category lists
+    RSS_CATEGORY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Approximate memory budget for category lists
+    RSS_BACKGROUND_REFRESH: bool = True  # Proactively refresh subscribed categories
+    RSS_REFRESH_INTERVAL: int = 300  # Seconds between background refresh passes
+    RSS_REFRESH_CONCURRENCY: int = 4  # Upstream fetches in flight per refresh pass
+    RSS_FAILURE_TTL: int = 60  # Seconds a failed category fetch is remembered before the request path retries it
+    RSS_MANUAL_REFRESH_MIN_AGE: int = 60  # /api/refresh-feeds leaves categories fetched more recently than this alone
+    HTTP_TIMEOUT: float = 10.0  # Seconds per upstream request
+    HTTP_MAX_CONNECTIONS: int = 50  # Pooled connections across all upstream hosts
+    HTTP_MAX_KEEPALIVE: int = 20  # Idle connections kept open for reuse
+    HTTP_KEEPALIVE_EXPIRY: float = 60.0  # Seconds an idle connection stays in the pool
+    HTTP_MAX_PER_HOST: int = 8  # Concurrent requests to any single upstream host
+    HTTP2_ENABLED: bool = True  # Negotiate HTTP/2 where supported (needs the h2 package)
+    HTTP_CACHE_DIR: str = ".http_cache"  # On-disk upstream response cache; empty disables conditional GETs
+    ARXIV_BATCH_QUERIES: bool = True  # Combine several arXiv categories into one OR query
+    ARXIV_BATCH_MAX_URL: int = 1500  # Maximum length of a batched arXiv query URL
+    ARXIV_BATCH_MAX_RESULTS: int = 200  # Maximum entries requested by one batched arXiv query
+    ARXIV_BATCH_FOLLOWUPS: int = 2  # Extra OR queries a batch may send for topics crowded out of its page
+    ARXIV_FAST_PARSER: bool = True  # Parse arXiv responses with the streaming expat parser instead of feedparser
+    FEED_ITEMS_PERSIST: bool = True  # Store fetched items in the feed_items table
+    FEED_READ_FROM_DB: bool = False  # Serve feed pages from feed_items instead of the in-memory cache
+    ADMIN_PAGE_SIZE: int = 50  # Users per admin panel page
+    RESPONSE_CACHE_MAX_ENTRIES: int = 5000  # Rendered page/API bodies kept per ETag
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # Approximate memory budget for rendered and compressed bodies
+    COMPRESS_MIN_SIZE: int = 1024  # Bodies smaller than this many bytes are sent uncompressed
+    FRAGMENT_CACHE_MAX_ENTRIES: int = 20000  # Pre-rendered feed item fragments kept in memory
+    FRAGMENT_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # Approximate memory budget for item fragments
+    STATIC_FINGERPRINTS: bool = True  # Link static files by content hash and serve them as immutable
+    FEED_PAGE_SIZE: int = 20  # Feed items rendered with the page and returned per /api/feed call
+    FEED_PAGE_MAX: int = 100  # Largest page size /api/feed accepts
+    HOME_STREAMING: bool = True  # Flush the /home shell first and stream categories in as they arrive
+    HOME_STREAM_DEADLINE: float = 3.0  # Seconds /home waits on upstream before skipping the remaining categories
+    SSE_KEEPALIVE: float = 15.0  # Seconds between keep-alive comments on idle event streams
+    SSE_QUEUE_SIZE: int = 100  # Undelivered updates buffered per event stream before the oldest are dropped
+    SEARCH_MAX_DOCS: int = 50000  # Feed items kept in the full-text index, most recently ingested first
+    SEARCH_MAX_RESULTS: int = 50  # Largest result count /api/search returns
+    DEDUP_ENABLED: bool = True  # Collapse versions, editions and near-duplicate titles into one item
+    DEDUP_THRESHOLD: float = 0.8  # Estimated title similarity above which two items are the same work
+    DEDUP_MAX_ITEMS: int = 50000  # Works remembered for cross-category duplicate detection
     ADMIN_EMAIL: str  # Add admin email from .env
     class Config:
         env_file = ".env"
@@ -43,7 +115,21 @@ settings = Settings()
 # =====================
 # FastAPI App & Middleware
 # =====================
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    upstream.start()
+    if settings.RSS_BACKGROUND_REFRESH:
+        refresh_scheduler.start()
+    dedup_bootstrap = asyncio.create_task(bootstrap_deduplicator())
+    search_bootstrap = asyncio.create_task(bootstrap_search_index())
+    yield
+    dedup_bootstrap.cancel()
+    search_bootstrap.cancel()
+    await refresh_scheduler.stop()
+    await upstream.close()
+    await async_engine.dispose()
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(SessionMiddleware, secret_key=settings.SESSION_SECRET)
 app.add_middleware(
     CORSMiddleware,
@@ -52,23 +138,325 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Static files are hashed and precompressed once at startup; templates link them with asset_url()
+static_manifest = AssetManifest("static")
+if settings.STATIC_FINGERPRINTS:
+    static_manifest.build()
+app.mount("/static", FingerprintedStaticFiles(directory="static", manifest=static_manifest), name="static")
 
 # =====================
 # Templates
 # =====================
 templates = Jinja2Templates(directory="templates")
 
+def asset_url(path: str) -> str:
+    """URL of a static file under its fingerprinted name, which browsers may cache indefinitely"""
+    return f"/static/{static_manifest.url_path(path)}"
+
+templates.env.globals["asset_url"] = asset_url
+
+def render_template(name: str, context: Dict[str, Any]) -> str:
+    return templates.get_template(name).render(context)
+
+# =====================
+# Feed Item Fragments
+# =====================
+# Feed page template -> partial its items are rendered with
+FEED_ITEM_TEMPLATES = {
+    "rss_feed.html": "feed_item.html",
+    "books_feed.html": "book_item.html",
+    "research_feed.html": "research_item.html",
+}
+
+# An item's markup is the same for every user; favourite state and position are filled in per request
+item_fragments = FragmentCache(
+    templates.env,
+    slots=("favorite", "active", "fav_id", "label", "position"),
+    max_entries=settings.FRAGMENT_CACHE_MAX_ENTRIES,
+    max_bytes=settings.FRAGMENT_CACHE_MAX_BYTES,
+)
+
+def _fragment_key(item: Dict[str, Any]):
+    if not item.get('item_hash'):
+        return None
+    # An item keeps its hash across upstream edits, and lists other categories in other feeds;
+    # the content hash covers every other field the partials render
+    categories = item.get('categories')
+    content_hash = item.get('content_hash') or FeedItem.compute_content_hash(item)
+    return (item['item_hash'], work_key(item), content_hash, item.get('link'), item.get('published_ts'),
+            tuple(categories) if categories else item.get('category'))
+
+def _favourite_overlay(item: Dict[str, Any], position: int) -> Dict[str, str]:
+    if item.get('is_favorite'):
+        return {
+            "favorite": "favorite",
+            "active": "active",
+            "fav_id": f' data-fav-id="{escape(item["favorite_id"])}"',
+            "label": "★ Favorited",
+            "position": str(position),
+        }
+    return {"favorite": "", "active": "", "fav_id": "", "label": "☆ Add to Favorites", "position": str(position)}
+
+def template_version(*names: str) -> List[str]:
+    """Source versions of templates, so a deploy that only changes markup still changes page ETags"""
+    return [item_fragments.version(name) for name in names]
+
+def render_feed_items(template_name: str, feed_items: List[Dict[str, Any]]) -> Markup:
+    """Markup of a feed page's items, from cached fragments plus the per-request favourite overlay"""
+    return item_fragments.render(FEED_ITEM_TEMPLATES[template_name], feed_items, _fragment_key, _favourite_overlay)
+
+# =====================
+# Conditional & Compressed Responses
+# =====================
+# ETag -> {content coding (None for identity): body}; a body is rendered and compressed once per version
+response_cache = LRUCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+)
+
+def make_etag(*parts) -> str:
+    """Strong ETag over everything a response is rendered from"""
+    raw = json.dumps(parts, default=str, separators=(',', ':'), ensure_ascii=False)
+    return '"%s"' % hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+def _negotiate_encoding(request: Request) -> Optional[str]:
+    available = ("br", "gzip") if brotli is not None else ("gzip",)
+    return preferred_encoding(request.headers.get("accept-encoding", ""), available)
+
+def _variant_etag(etag: str, encoding: Optional[str]) -> str:
+    # Each content coding is its own representation, so it gets its own strong validator
+    return etag if encoding is None else f'{etag[:-1]}-{encoding}"'
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    base = etag.strip('"')
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        candidate = candidate.strip('"')
+        if candidate == base or candidate.split("-", 1)[0] == base:
+            return True
+    return False
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+def conditional_response(request: Request, etag: str, render: Callable[[], Union[str, bytes]],
+                         media_type: str) -> Response:
+    """
+    Answer If-None-Match with a 304, or serve the body for this ETag; either way the body comes
+    from the response cache and is rendered and compressed on first use only. The coding is
+    chosen once the body size is known, so a 304 names the same variant a 200 would send.
+    """
+    variants = response_cache.get(etag)
+    stored = variants is not None
+    if variants is None:
+        body = render()
+        variants = {None: body.encode("utf-8") if isinstance(body, str) else body}
+    encoding = _negotiate_encoding(request)
+    if len(variants[None]) < settings.COMPRESS_MIN_SIZE:
+        encoding = None
+    headers = {"Cache-Control": "private, no-cache", "Vary": "Accept-Encoding"}
+    if _etag_matches(request, etag):
+        if not stored:
+            response_cache.set(etag, variants, size=len(variants[None]))
+        headers["ETag"] = _variant_etag(etag, encoding)
+        return Response(status_code=304, headers=headers)
+    if encoding not in variants:
+        variants[encoding] = _compress(variants[None], encoding)
+        stored = False
+    if not stored:
+        response_cache.set(etag, variants, size=sum(len(v) for v in variants.values()))
+    headers["ETag"] = _variant_etag(etag, encoding)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(variants[encoding], media_type=media_type, headers=headers)
+
+def json_body(content: Any) -> bytes:
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def feed_page_response(request: Request, template_name: str, ctx: UserContext, feed_items: List[Dict[str, Any]],
+                       next_cursor: Optional[str], context: Dict[str, Any]) -> Response:
+    """A feed page versioned by its templates, the items it shows and the user's favourites"""
+    etag = make_etag(template_name, template_version(template_name, FEED_ITEM_TEMPLATES[template_name]),
+                     ctx.email, feed_items, next_cursor, ctx.favourites, static_manifest.version)
+
+    def render() -> str:
+        return render_template(template_name, {
+            "request": request,
+            "feed_items": feed_items,
+            "feed_items_html": render_feed_items(template_name, feed_items),
+            "next_cursor": next_cursor,
+            "user": ctx,
+            "favourites": ctx.favourites,
+            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            **context,
+        })
+    return conditional_response(request, etag, render, "text/html; charset=utf-8")
+
+# =====================
+# Shared HTTP Client
+# =====================
+class UpstreamHTTP:
+    """
+    Application-scoped httpx client shared by every upstream call, so connections
+    (and their TLS sessions) are kept alive and reused across requests.
+    """
+    def __init__(self, response_cache: Optional[HttpResponseCache] = None):
+        self.client: Optional[httpx.AsyncClient] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self.response_cache = response_cache
+
+    def start(self) -> httpx.AsyncClient:
+        if self.client is None or self.client.is_closed:
+            http2 = settings.HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+            self.client = httpx.AsyncClient(
+                http2=http2,
+                timeout=settings.HTTP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+                ),
+            )
+        return self.client
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        self._host_slots = {}
+
+    def _slot(self, url: str) -> asyncio.Semaphore:
+        # httpx only limits the pool as a whole, so cap each host separately
+        host = urlsplit(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(settings.HTTP_MAX_PER_HOST)
+        return self._host_slots[host]
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        # Lazily start for callers outside the app lifespan (scripts, shells)
+        client = self.start()
+        async with self._slot(url):
+            return await client.request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def get_conditional(self, url: str, have_copy: bool = False) -> Tuple[Optional[bytes], bool]:
+        """
+        GET with If-None-Match / If-Modified-Since from the persistent response cache.
+        Returns (raw body bytes, modified); parsers decode it themselves. On a 304 the body
+        is None when the caller already holds a parsed copy (have_copy), otherwise it is
+        read back from the on-disk cache.
+        """
+        if self.response_cache is None:
+            response = await self.get(url)
+            response.raise_for_status()
+            return response.content, True
+        validators = await run_in_threadpool(self.response_cache.load_validators, url)
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        response = await self.get(url, headers=headers)
+        if response.status_code == 304 and validators:
+            await run_in_threadpool(self.response_cache.touch, url)
+            if have_copy:
+                return None, False
+            body = await run_in_threadpool(self.response_cache.load_body, url)
+            if body is not None:
+                return body, False
+            # Body went missing on disk; fetch it again without validators
+            response = await self.get(url)
+        response.raise_for_status()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            await run_in_threadpool(self.response_cache.store, url, etag, last_modified, response.content)
+        return response.content, True
+
+upstream = UpstreamHTTP(HttpResponseCache(settings.HTTP_CACHE_DIR) if settings.HTTP_CACHE_DIR else None)
+
+# =====================
+# Google JWKS Key Cache
+# =====================
+class GoogleJWKSCache:
+    """
+    Google's OAuth signing keys, parsed once into verification keys and cached for the
+    max-age Google sends. Expired keys keep verifying while a background refresh runs;
+    only an unknown kid makes a login wait for a re-fetch.
+    """
+    CERTS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+    DEFAULT_MAX_AGE = 3600
+    MIN_REFETCH_INTERVAL = 60  # Don't let tokens with bogus kids hammer the certs endpoint
+
+    def __init__(self):
+        self._keys: Dict[str, Any] = {}
+        self._expires_at = 0.0
+        # Monotonic time of the last successful fetch; a failed one doesn't hold off a retry
+        self._last_fetch = float("-inf")
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _max_age(self, cache_control: str) -> int:
+        match = re.search(r"max-age=(\d+)", cache_control or "")
+        return int(match.group(1)) if match else self.DEFAULT_MAX_AGE
+
+    async def _fetch(self):
+        async with self._lock:
+            # Another caller may have refreshed while we waited for the lock
+            if time.monotonic() - self._last_fetch < self.MIN_REFETCH_INTERVAL:
+                return
+            response = await upstream.get(self.CERTS_URL)
+            response.raise_for_status()
+            self._keys = {
+                key["kid"]: jwk.construct(key, algorithm=key.get("alg", "RS256"))
+                for key in response.json()["keys"]
+            }
+            self._last_fetch = time.monotonic()
+            self._expires_at = self._last_fetch + self._max_age(response.headers.get("Cache-Control"))
+
+    def _refresh_in_background(self):
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._fetch())
+
+            def _done(t: asyncio.Task):
+                if not t.cancelled() and t.exception() is not None:
+                    logging.error(f"Google JWKS refresh failed: {t.exception()}")
+            self._refresh_task.add_done_callback(_done)
+
+    async def get_key(self, kid: str):
+        key = self._keys.get(kid)
+        if key is not None:
+            if time.monotonic() >= self._expires_at:
+                self._refresh_in_background()
+            return key
+        await self._fetch()
+        return self._keys.get(kid)
+
+google_jwks = GoogleJWKSCache()
+
 # =====================
 # Helper: Verify Google JWT signature
 # =====================
-def verify_google_jwt(id_token):
+async def verify_google_jwt(id_token):
     try:
-        resp = requests.get('https://www.googleapis.com/oauth2/v3/certs')
-        keys = resp.json()['keys']
         header = jwt.get_unverified_header(id_token)
         kid = header['kid']
-        key = next((k for k in keys if k['kid'] == kid), None)
+        key = await google_jwks.get_key(kid)
         if not key:
             raise Exception('Public key not found in Google certs')
         payload = jwt.decode(
@@ -92,155 +480,1086 @@ def get_current_user(request: Request):
         raise HTTPException(status_code=status.HTTP_303_SEE_OTHER, headers={"Location": "/"})
     return email
 
+# =====================
+# Feed Ordering
+# =====================
+def feed_order_key(item: Dict[str, Any]) -> Tuple[float, str]:
+    """Feeds are ordered on (published_ts, item_hash) descending; the hash breaks ties between equal dates"""
+    return item['published_ts'], item['item_hash']
+
+def work_key(item: Dict[str, Any]) -> str:
+    """Identity of the work an item represents; its other versions and editions share it"""
+    return item.get('work_hash') or item['item_hash']
+
+deduplicator = Deduplicator(
+    FeedItem.compute_hash,
+    threshold=settings.DEDUP_THRESHOLD,
+    max_items=settings.DEDUP_MAX_ITEMS,
+)
+
+def _read_recent_identities(limit: int) -> List[Dict[str, Any]]:
+    with get_db_session() as db:
+        return [row._asdict() for row in FeedItem.recent_identities(db, limit)]
+
+async def bootstrap_deduplicator(chunk_size: int = 500) -> None:
+    """
+    Teach the deduplicator the stored works at startup, so editions fetched after a restart
+    join the work_hash their siblings were stored under instead of starting a new work
+    """
+    if not settings.FEED_ITEMS_PERSIST or not settings.DEDUP_ENABLED:
+        return
+    try:
+        rows = await run_in_threadpool(_read_recent_identities, settings.DEDUP_MAX_ITEMS)
+    except Exception as e:
+        logging.error(f"Loading stored works for deduplication failed: {e}")
+        return
+    # Oldest first, so the most recent works are the last ones the deduplicator would forget
+    rows.reverse()
+    for i in range(0, len(rows), chunk_size):
+        for row in rows[i:i + chunk_size]:
+            deduplicator.identify(row)
+        await asyncio.sleep(0)
+
+def sort_newest_first(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Order one category's items newest first; done once per fetch"""
+    items.sort(key=feed_order_key, reverse=True)
+    return items
+
+def prepare_category_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Ingestion stage for a fetched category list: give each item its canonical item_hash and
+    the work_hash its other versions and editions share, fingerprint its displayed fields,
+    drop duplicates and sort
+    """
+    if settings.DEDUP_ENABLED:
+        items = deduplicator.collapse(items)
+    for item in items:
+        item['content_hash'] = FeedItem.compute_content_hash(item)
+    return sort_newest_first(items)
+
+def merge_newest_first(lists: List[List[Dict[str, Any]]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    K-way heap merge of per-category lists that are each sorted newest first.
+    Works listed under several categories are kept once, as a copy of their newest item carrying
+    every category in 'categories', which also keeps feed order keys unique for cursors; with a
+    limit, merging stops after that many items instead of ordering everything.
+    """
+    merged = []
+    positions = {}
+    for item in heapq.merge(*lists, key=feed_order_key, reverse=True):
+        position = positions.get(work_key(item))
+        if position is not None:
+            kept = merged[position]
+            categories = kept.get('categories', [kept['category']])
+            if item['category'] not in categories:
+                merged[position] = dict(kept, categories=categories + [item['category']])
+            continue
+        if limit is not None and len(merged) >= limit:
+            break
+        positions[work_key(item)] = len(merged)
+        merged.append(item)
+    return merged
+
+def encode_feed_cursor(item: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just past item"""
+    raw = json.dumps([item['published_ts'], item['item_hash']], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_feed_cursor(cursor: str) -> Tuple[float, str]:
+    """Inverse of encode_feed_cursor; raises ValueError on anything that isn't one of our cursors"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        published_ts, item_hash = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError(f"Invalid feed cursor: {cursor!r}")
+    if not isinstance(published_ts, (int, float)) or not isinstance(item_hash, str):
+        raise ValueError(f"Invalid feed cursor: {cursor!r}")
+    return float(published_ts), item_hash
+
+def feed_page(items: List[Dict[str, Any]], cursor: Optional[str], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Slice a merged feed into a page starting after cursor. The start is found by binary search
+    on the feed order, so a cursor stays valid when newer items are merged in above it.
+    Returns the page and the cursor of the next page, or None on the last one.
+    """
+    start = 0
+    if cursor:
+        after = decode_feed_cursor(cursor)
+        lo, hi = 0, len(items)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if feed_order_key(items[mid]) >= after:
+                lo = mid + 1
+            else:
+                hi = mid
+        start = lo
+    page = items[start:start + limit]
+    next_cursor = encode_feed_cursor(page[-1]) if page and start + limit < len(items) else None
+    return page, next_cursor
+
+# =====================
+# Full-Text Search
+# =====================
+# Feed items are indexed once per work. The payload is only (item_hash, type, content_hash,
+# categories it was seen under); results are hydrated from the category cache or feed_items
+feed_search_index = SearchIndex(
+    {'title': 3.0, 'authors': 2.0, 'category': 1.5, 'summary': 1.0},
+    max_docs=settings.SEARCH_MAX_DOCS,
+)
+# Small per-user indexes over favourites, built on first search and dropped when favourites change
+favourite_search_indexes = LRUCache(max_entries=1000, max_age=settings.RSS_CACHE_TTL)
+
+def index_feed_items(items: List[Dict[str, Any]], oldest: bool = False) -> None:
+    """Add items to the full-text index as they enter the category cache"""
+    for item in items:
+        content_hash = item.get('content_hash') or FeedItem.compute_content_hash(item)
+        existing = feed_search_index.get(work_key(item))
+        if existing is not None:
+            item_hash, _, indexed_hash, categories = existing
+            if oldest and (item_hash != item['item_hash'] or item['category'] in categories):
+                # What is indexed already is at least as recent as a stored row; only add its category
+                continue
+            if item['category'] in categories and item_hash == item['item_hash'] and indexed_hash == content_hash:
+                continue
+            categories = categories | {item['category']}
+        else:
+            categories = frozenset([item['category']])
+        feed_search_index.add(work_key(item), {
+            'title': item.get('title'),
+            'authors': item.get('authors'),
+            # Ids and labels, so "cs.LG" and "machine learning" both find the item
+            'category': ' '.join(f"{c} {taxonomy.category_label(item['type'], c)}" for c in sorted(categories)),
+            'summary': item.get('summary'),
+        }, payload=(item['item_hash'], item['type'], content_hash, categories), oldest=oldest)
+
+def _read_stored_items(item_hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+    with get_db_session() as db:
+        return {h: row.to_dict() for h, row in FeedItem.get_by_hashes(db, item_hashes).items()}
+
+async def hydrate_search_results(payloads: List[Tuple[str, str, str, frozenset]]) -> List[Optional[Dict[str, Any]]]:
+    """Feed items behind search payloads, from the category cache first and feed_items otherwise"""
+    items = [feed_cache.find_item(type_, categories, item_hash) for item_hash, type_, _, categories in payloads]
+    missing = [payload[0] for payload, item in zip(payloads, items) if item is None]
+    if missing and settings.FEED_ITEMS_PERSIST:
+        try:
+            stored = await run_in_threadpool(_read_stored_items, missing)
+        except Exception as e:
+            logging.error(f"Loading search results from feed_items failed: {e}")
+            stored = {}
+        items = [item or stored.get(payload[0]) for payload, item in zip(payloads, items)]
+    return items
+
+def _read_recent_feed_items(limit: int, offset: int) -> List[Dict[str, Any]]:
+    with get_db_session() as db:
+        return [row.to_dict() for row in FeedItem.recently_updated(db, limit, offset)]
+
+async def bootstrap_search_index(chunk_size: int = 500) -> None:
+    """
+    Index previously ingested items at startup, newest first and one chunk of rows at a time,
+    so neither the whole table nor the event loop is held while it runs
+    """
+    if not settings.FEED_ITEMS_PERSIST:
+        return
+    for offset in range(0, settings.SEARCH_MAX_DOCS, chunk_size):
+        try:
+            items = await run_in_threadpool(_read_recent_feed_items, chunk_size, offset)
+        except Exception as e:
+            logging.error(f"Loading feed items for the search index failed: {e}")
+            return
+        # Each chunk is older than everything indexed so far, including live ingestion
+        index_feed_items(items, oldest=True)
+        if len(items) < chunk_size:
+            return
+        await asyncio.sleep(0)
+
+def favourite_search_index(ctx: UserContext) -> SearchIndex:
+    index = favourite_search_indexes.get(ctx.email)
+    if index is None:
+        index = SearchIndex({'title': 1.0, 'type': 0.5}, max_docs=max(len(ctx.favourites), 1))
+        for fav in ctx.favourites:
+            index.add(fav.id, {'title': fav.title, 'type': fav.type}, payload=fav)
+        favourite_search_indexes.set(ctx.email, index, size=0)
+    return index
+
 # =====================
 # Feed Cache System
 # =====================
 class FeedCache:
     def __init__(self):
-        self.cache = {}
-        self.last_update = {}
+        # Per-user combined feeds (lists of references into the category cache), cheap to rebuild
+        self.cache = LRUCache(
+            max_entries=settings.RSS_CACHE_MAX_ENTRIES,
+            max_age=settings.RSS_CACHE_TTL,
+            on_evict=self._unindex_feed,
+        )
+        # Secondary indexes over self.cache: user -> feed keys, category key -> feed keys
+        self._user_feed_keys: Dict[str, Set[Tuple]] = {}
+        self._category_feed_keys: Dict[Tuple[str, str, int], Set[Tuple]] = {}
+        # Shared upstream results, keyed on (source, category, max_results); kept past the TTL
+        # so they can be served stale while refreshing
+        self.category_cache = LRUCache(
+            max_entries=settings.RSS_CATEGORY_CACHE_MAX_ENTRIES,
+            max_bytes=settings.RSS_CATEGORY_CACHE_MAX_BYTES,
+            max_age=max(settings.RSS_CACHE_MAX_STALE, settings.RSS_CACHE_TTL),
+        )
+        # Categories whose last upstream fetch failed; requests don't retry them until this expires
+        self.failed_fetches = LRUCache(
+            max_entries=settings.RSS_CATEGORY_CACHE_MAX_ENTRIES,
+            max_age=settings.RSS_FAILURE_TTL,
+        )
+        # arXiv topic -> observed entries per second, which batch planning groups topics by
+        self.arxiv_volumes = LRUCache(
+            max_entries=settings.RSS_CATEGORY_CACHE_MAX_ENTRIES,
+            max_age=settings.RSS_CACHE_MAX_STALE,
+        )
+        # One shared fetch task per key while it is running (single-flight)
+        self._inflight: Dict[Any, asyncio.Task] = {}
+        # Newly ingested items per (source, category), pushed to /api/feed-events subscribers
+        self.events = PubSub(max_queue=settings.SSE_QUEUE_SIZE)
+
+    def _feed_categories(self, feed_key: Tuple) -> List[Tuple[str, str, int]]:
+        _, book_categories, arxiv_topics, max_results = feed_key
+        return ([('book', c, max_results) for c in book_categories] +
+                [('arxiv', t, max_results) for t in arxiv_topics])
+
+    def _index_feed(self, feed_key: Tuple) -> None:
+        self._user_feed_keys.setdefault(feed_key[0], set()).add(feed_key)
+        for category_key in self._feed_categories(feed_key):
+            self._category_feed_keys.setdefault(category_key, set()).add(feed_key)
+
+    def _unindex_feed(self, feed_key: Tuple, _value=None) -> None:
+        """Eviction hook for self.cache; keeps the secondary indexes in step with the LRU"""
+        user_keys = self._user_feed_keys.get(feed_key[0])
+        if user_keys is not None:
+            user_keys.discard(feed_key)
+            if not user_keys:
+                del self._user_feed_keys[feed_key[0]]
+        for category_key in self._feed_categories(feed_key):
+            feed_keys = self._category_feed_keys.get(category_key)
+            if feed_keys is not None:
+                feed_keys.discard(feed_key)
+                if not feed_keys:
+                    del self._category_feed_keys[category_key]
+
+    def _is_fresh(self, cache: LRUCache, key, now: datetime) -> bool:
+        stored_at = cache.stored_at(key)
+        return stored_at is not None and (now - stored_at).total_seconds() < settings.RSS_CACHE_TTL
+
+    def _start_flight(self, key, factory) -> asyncio.Task:
+        """
+        Return the running task for key, starting one from factory() if none is in flight.
+        The task is independent of its callers, so one caller being cancelled never aborts the others.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            return task
+        task = asyncio.create_task(factory())
+        self._inflight[key] = task
+
+        def _done(t: asyncio.Task):
+            if self._inflight.get(key) is t:
+                del self._inflight[key]
+            # Retrieve the exception so a flight nobody awaited anymore doesn't log as unhandled
+            if not t.cancelled() and t.exception() is not None:
+                print(f"Error fetching {key}: {t.exception()}")
+        task.add_done_callback(_done)
+        return task
+
+    async def _single_flight(self, key, factory):
+        """Await the shared fetch for key; concurrent callers all receive its result or exception"""
+        return await asyncio.shield(self._start_flight(key, factory))
+
+    async def get_category_items(self, source: str, category: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """
+        Return the shared item list for one upstream category.
+        Expired entries are served stale while a background refresh runs; only cold misses wait on upstream.
+        A category whose last fetch failed is served as it is (or empty) until RSS_FAILURE_TTL has passed.
+        """
+        key = (source, category, max_results)
+        if key not in self.category_cache and key not in self.failed_fetches and settings.FEED_ITEMS_PERSIST:
+            # After a restart, serve what was last ingested instead of cold-fetching
+            await self._single_flight(('stored', key), lambda: self._load_stored_category(source, category, max_results))
+        items = self.category_cache.get(key)
+        if items is not None:
+            if not self._is_fresh(self.category_cache, key, datetime.now()) and key not in self.failed_fetches:
+                self.schedule_refresh(source, category, max_results)
+            return items
+        if key in self.failed_fetches:
+            return []
+        return await self.refresh_category(source, category, max_results)
+
+    def _read_stored_category(self, source: str, category: str, max_results: int) -> Tuple[List[Dict[str, Any]], Optional[datetime]]:
+        with get_db_session() as db:
+            rows = FeedItem.latest_for_category(db, source, category, max_results)
+            if not rows:
+                return [], None
+            # Carry the rows' age over onto the application clock that LRUCache compares against
+            stored_at = datetime.now() - timedelta(seconds=FeedItem.age_seconds(db, rows))
+            return [row.to_dict() for row in rows], stored_at
+
+    async def _load_stored_category(self, source: str, category: str, max_results: int) -> None:
+        key = (source, category, max_results)
+        if key in self.category_cache:
+            return
+        try:
+            items, stored_at = await run_in_threadpool(self._read_stored_category, source, category, max_results)
+        except Exception as e:
+            print(f"Error loading stored {source} items for {category}: {e}")
+            return
+        if items and key not in self.category_cache:
+            # Editions stored separately under one work_hash collapse to the newest here
+            items = prepare_category_items(items)
+            # Keep the stored age so stale rows are refreshed in the background
+            self.category_cache.set(key, items, stored_at=stored_at)
+            index_feed_items(items)
+
+    def _store_items(self, items: List[Dict[str, Any]]) -> int:
+        with get_db_session() as db:
+            return FeedItem.upsert_items(db, items)
+
+    async def ingest(self, items: List[Dict[str, Any]]) -> None:
+        """Upsert freshly fetched items into the feed_items table"""
+        if not settings.FEED_ITEMS_PERSIST or not items:
+            return
+        try:
+            await run_in_threadpool(self._store_items, items)
+        except Exception as e:
+            print(f"Error storing feed items: {e}")
+
+    async def refresh_category(self, source: str, category: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """
+        Fetch one category from upstream and store it in the shared category cache.
+        Concurrent refreshes of the same category share a single upstream request.
+        """
+        key = (source, category, max_results)
+        return await self._single_flight(('category', key), lambda: self._fetch_category(source, category, max_results))
+
+    async def _fetch_category(self, source: str, category: str, max_results: int) -> List[Dict[str, Any]]:
+        key = (source, category, max_results)
+        if source == 'book':
+            items = await self.fetch_google_books(category, max_results=max_results)
+        else:
+            items = await self.fetch_arxiv_api(category, max_results=max_results)
+        if items is None:
+            # Fetchers return None on upstream errors: keep serving the old list, if any, and hold
+            # off retries from the request path; an empty list is a real result and is cached
+            self.failed_fetches.set(key, True, size=0)
+            return self.category_cache.peek(key, [])
+        self.failed_fetches.pop(key)
+        # A 304 hands back the cached list itself; only new payloads need ingesting
+        if items is self.category_cache.peek(key):
+            self.category_cache.touch(key)
+        else:
+            await self.ingest(items)
+            self._replace_category(key, items)
+        return self.category_cache.peek(key, items)
+
+    def _replace_category(self, key: Tuple[str, str, int], items: List[Dict[str, Any]]) -> None:
+        """
+        Store a freshly fetched category list, drop the user feeds built from the old one and
+        publish the items the old list didn't have to the category's subscribers
+        """
+        source, category, max_results = key
+        previous = self.category_cache.peek(key)
+        self.category_cache.set(key, items)
+        self.invalidate_category(source, category, max_results)
+        index_feed_items(items)
+        # A cold fetch is what the requesting page renders anyway; only refreshes produce news
+        if previous is not None and self.events.has_subscribers((source, category)):
+            known = {work_key(item) for item in previous}
+            new_items = [item for item in items if work_key(item) not in known]
+            if new_items:
+                self.events.publish((source, category), new_items)
+
+    def schedule_refresh(self, source: str, category: str, max_results: int = 10) -> None:
+        """
+        Refresh a category in the background unless a refresh for it is already running
+        """
+        key = (source, category, max_results)
+        self._start_flight(('category', key), lambda: self._fetch_category(source, category, max_results))
+
+    def find_item(self, source: str, categories: Set[str], item_hash: str, max_results: int = 10) -> Optional[Dict[str, Any]]:
+        """A cached item by hash, looked up in the given categories' lists"""
+        for category in categories:
+            for item in self.category_cache.peek((source, category, max_results), ()):
+                if item['item_hash'] == item_hash:
+                    return item
+        return None
+
+    def category_age(self, source: str, category: str, max_results: int = 10) -> Optional[float]:
+        """Seconds since a category was last fetched, or None if it has never been cached"""
+        updated = self.category_cache.stored_at((source, category, max_results))
+        if updated is None:
+            return None
+        return (datetime.now() - updated).total_seconds()
 
-    async def fetch_google_books(self, category_id: str, max_results: int = 10) -> List[Dict[str, Any]]:
+    async def fetch_google_books(self, category_id: str, max_results: int = 10) -> Optional[List[Dict[str, Any]]]:
         """
-        Fetch latest books from Google Books API for a given category, with configurable max_results
+        Fetch latest books from Google Books API for a given category, with configurable max_results.
+        Returns None if the request failed.
         """
         url = f"https://www.googleapis.com/books/v1/volumes?q=subject:{category_id}&orderBy=newest&maxResults={max_results}"
+        cached = self.category_cache.peek(('book', category_id, max_results))
         items = []
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
-                for book in data.get('items', []):
-                    volume = book.get('volumeInfo', {})
-                    published = volume.get('publishedDate', '')
-                    items.append({
-                        'title': volume.get('title', ''),
-                        'link': volume.get('infoLink', ''),
-                        'summary': volume.get('description', ''),
-                        'published': published,
-                        'type': 'book',
-                        'category': category_id,
-                        'authors': ', '.join(volume.get('authors', [])),
-                        'thumbnail': volume.get('imageLinks', {}).get('thumbnail', ''),
-                    })
+            body, modified = await upstream.get_conditional(url, have_copy=cached is not None)
+            if not modified and cached is not None:
+                # 304: keep the already-parsed items, the caller just extends their lifetime
+                return cached
+            data = json.loads(body)
+            for book in data.get('items', []):
+                volume = book.get('volumeInfo', {})
+                published = volume.get('publishedDate', '')
+                identifiers = {i.get('type'): i.get('identifier') for i in volume.get('industryIdentifiers', [])}
+                items.append({
+                    'title': volume.get('title', ''),
+                    'link': volume.get('infoLink', ''),
+                    'summary': volume.get('description', ''),
+                    'published': published,
+                    'published_ts': parse_published(published),
+                    'item_hash': FeedItem.compute_hash('book', volume.get('infoLink', '')),
+                    'type': 'book',
+                    'category': category_id,
+                    'authors': ', '.join(volume.get('authors', [])),
+                    'thumbnail': volume.get('imageLinks', {}).get('thumbnail', ''),
+                    'isbn': normalize_isbn(identifiers.get('ISBN_13') or identifiers.get('ISBN_10')),
+                })
         except Exception as e:
             print(f"Error fetching Google Books API: {e}")
-        return items
+            return None
+        return prepare_category_items(items)
 
-    async def fetch_book_feeds(self, categories: List[str], max_results: int = 10) -> List[Dict[str, Any]]:
+    async def fetch_book_feeds(self, categories: List[str], max_results: int = 10) -> None:
         """
-        Fetch latest books from Google Books API for each selected category (by book_category_id)
+        Make sure each selected book category (by book_category_id) is in the category cache
         """
         if not categories:
-            return []
-        feed_items = []
+            return
         tasks = []
         for category in categories:
-            tasks.append(self.fetch_google_books(category, max_results=max_results))
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for result in results:
-                if isinstance(result, Exception):
-                    print(f"Error fetching Google Books: {result}")
-                else:
-                    feed_items.extend(result)
-        return feed_items
+            tasks.append(self.get_category_items('book', category, max_results=max_results))
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Error fetching Google Books: {result}")
 
-    async def fetch_arxiv_api(self, category_code: str, max_results: int = 10) -> List[Dict[str, Any]]:
+    def _arxiv_url(self, categories: List[str], max_results: int) -> str:
+        base_url = "http://export.arxiv.org/api/query"
+        search = "+OR+".join(f"cat:{category}" for category in categories)
+        query = f"search_query={search}&sortBy=submittedDate&sortOrder=descending&start=0&max_results={max_results}"
+        return f"{base_url}?{query}"
+
+    def _parse_arxiv_entries(self, body: bytes) -> List[Dict[str, Any]]:
         """
-        Fetch latest research papers from arXiv API for a given category, with configurable max_results
+        Compact entry records of an arXiv response. The expat parser handles the well-formed
+        responses arXiv sends, straight from the raw bytes; anything it rejects goes through
+        the more forgiving feedparser, which is why the whole body is read first.
         """
-        base_url = "http://export.arxiv.org/api/query"
-        query = f"search_query=cat:{category_code}&sortBy=submittedDate&sortOrder=descending&start=0&max_results={max_results}"
-        url = f"{base_url}?{query}"
+        if settings.ARXIV_FAST_PARSER:
+            try:
+                return parse_arxiv_feed(body)
+            except ExpatError as e:
+                print(f"Falling back to feedparser for malformed arXiv response: {e}")
+        return [
+            {
+                'title': entry.get('title', ''),
+                'link': entry.get('link', ''),
+                'summary': entry.get('summary', ''),
+                'published': entry.get('published', entry.get('updated', '')),
+                'authors': [a.get('name', '') for a in entry.get('authors', [])],
+                'categories': [tag.get('term') for tag in entry.get('tags', [])],
+            }
+            for entry in feedparser.parse(body).entries
+        ]
+
+    def _arxiv_item(self, entry: Dict[str, Any], category_code: str) -> Dict[str, Any]:
+        published = entry.get('published', '')
+        authors = ', '.join(entry.get('authors', []))
+        summary = entry.get('summary', '')
+        link = entry.get('link', '')
+        return {
+            'title': entry.get('title', ''),
+            'link': link,
+            'summary': summary,
+            'published': published,
+            'published_ts': parse_published(published),
+            'item_hash': FeedItem.compute_hash('arxiv', link),
+            'type': 'arxiv',
+            'category': category_code,
+            'authors': authors
+        }
+
+    async def fetch_arxiv_api(self, category_code: str, max_results: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch latest research papers from arXiv API for a given category, with configurable max_results.
+        Returns None if the request failed.
+        """
+        url = self._arxiv_url([category_code], max_results)
+        cached = self.category_cache.peek(('arxiv', category_code, max_results))
         items = []
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=10.0)
-                response.raise_for_status()
-                feed = feedparser.parse(response.text)
-                for entry in feed.entries:
-                    published = entry.get('published', entry.get('updated', ''))
-                    authors = ', '.join([a.get('name', '') for a in entry.get('authors', [])])
-                    summary = entry.get('summary', '')
-                    items.append({
-                        'title': entry.get('title', ''),
-                        'link': entry.get('link', ''),
-                        'summary': summary,
-                        'published': published,
-                        'type': 'arxiv',
-                        'category': category_code,
-                        'authors': authors
-                    })
+            body, modified = await upstream.get_conditional(url, have_copy=cached is not None)
+            if not modified and cached is not None:
+                return cached
+            for entry in self._parse_arxiv_entries(body):
+                items.append(self._arxiv_item(entry, category_code))
         except Exception as e:
             print(f"Error fetching arXiv API: {e}")
+            return None
+        items = prepare_category_items(items)
+        self._observe_arxiv_volume(category_code, items)
         return items
 
-    async def fetch_arxiv_feeds(self, topics: List[str], max_results: int = 10) -> List[Dict[str, Any]]:
+    def _observe_arxiv_volume(self, topic: str, items: List[Dict[str, Any]]) -> None:
+        """Remember how many entries per second a topic gets, from a complete newest-first list of it"""
+        if items:
+            oldest = min(item['published_ts'] for item in items)
+            self.arxiv_volumes.set(topic, len(items) / max(time.time() - oldest, 1.0), size=0)
+
+    def _arxiv_page_size(self, topics: List[str], max_results: int) -> int:
         """
-        Fetch latest research papers from arXiv API for each selected topic (by arxiv_topic_id)
+        Entries an OR query over topics must return for each of them to get max_results.
+        A page sorted by date covers one time window for every topic, which each fill in
+        proportion to their volume, so the quietest topic decides the size.
         """
-        if not topics:
+        volumes = [self.arxiv_volumes.peek(topic) for topic in topics]
+        size = max_results * len(topics)
+        if len(topics) > 1 and all(volume is not None for volume in volumes):
+            size = max(size, math.ceil(max_results * sum(volumes) / min(volumes)))
+        return size
+
+    def _plan_arxiv_batches(self, topics: List[str], max_results: int) -> List[List[str]]:
+        """
+        Pack topics into OR-query batches bounded by URL length and page size. Topics with an
+        observed volume are packed quietest first, so each batch holds topics of similar volume
+        and a busy category is never paired with quiet ones it would crowd out of the page.
+        Topics not seen yet are packed by count alone; their first fetch records their volume.
+        """
+        unique = sorted(set(topics))
+        known = sorted((t for t in unique if t in self.arxiv_volumes), key=self.arxiv_volumes.peek)
+        unknown = [t for t in unique if t not in self.arxiv_volumes]
+        batches = []
+        for group in (known, unknown):
+            current = []
+            for topic in group:
+                candidate = current + [topic]
+                requested = self._arxiv_page_size(candidate, max_results)
+                too_big = requested > settings.ARXIV_BATCH_MAX_RESULTS
+                too_long = len(self._arxiv_url(candidate, requested)) > settings.ARXIV_BATCH_MAX_URL
+                if current and (too_big or too_long):
+                    batches.append(current)
+                    candidate = [topic]
+                current = candidate
+            if current:
+                batches.append(current)
+        return batches
+
+    async def _query_arxiv_batch(self, topics: List[str], max_results: int,
+                                 have_copy: bool = False) -> Tuple[Optional[List[Dict[str, Any]]], bool]:
+        """
+        Entries of one OR query over topics, or None on a 304 when have_copy, and whether
+        they filled the requested page
+        """
+        requested = min(self._arxiv_page_size(topics, max_results),
+                        max(settings.ARXIV_BATCH_MAX_RESULTS, max_results))
+        body, modified = await upstream.get_conditional(self._arxiv_url(topics, requested), have_copy=have_copy)
+        if not modified and have_copy:
+            return None, False
+        entries = self._parse_arxiv_entries(body)
+        return entries, len(entries) >= requested
+
+    def _fill_arxiv_buckets(self, buckets: Dict[str, List[Dict[str, Any]]], entries: List[Dict[str, Any]],
+                            max_results: int) -> None:
+        for entry in entries:
+            for topic in entry['categories']:
+                if topic in buckets and len(buckets[topic]) < max_results:
+                    buckets[topic].append(self._arxiv_item(entry, topic))
+
+    async def fetch_arxiv_batch(self, topics: List[str], max_results: int = 10) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        """
+        Fetch several arXiv categories with one OR query and split the entries back into
+        per-category lists using each entry's category tags. Cross-listed papers land in
+        every requested category they are tagged with. Topics left short because busier ones
+        filled the page are fetched together by one follow-up OR query at a time, at most
+        ARXIV_BATCH_FOLLOWUPS of them. Every topic maps to None if the batch query failed.
+        """
+        cached = {topic: self.category_cache.peek(('arxiv', topic, max_results)) for topic in topics}
+        have_copy = all(items is not None for items in cached.values())
+        try:
+            entries, full = await self._query_arxiv_batch(topics, max_results, have_copy=have_copy)
+        except Exception as e:
+            print(f"Error fetching arXiv API batch: {e}")
+            return {topic: None for topic in topics}
+        if entries is None:
+            return cached
+        buckets = {topic: [] for topic in topics}
+        self._fill_arxiv_buckets(buckets, entries, max_results)
+        short = [topic for topic in topics if len(buckets[topic]) < max_results]
+        followups = 0
+        while full and short and followups < settings.ARXIV_BATCH_FOLLOWUPS:
+            followups += 1
+            retry = {topic: [] for topic in short}
+            try:
+                entries, full = await self._query_arxiv_batch(short, max_results)
+            except Exception as e:
+                print(f"Error fetching arXiv API follow-up batch: {e}")
+                break
+            self._fill_arxiv_buckets(retry, entries, max_results)
+            for topic, items in retry.items():
+                if len(items) > len(buckets[topic]):
+                    buckets[topic] = items
+            short = [topic for topic in short if len(buckets[topic]) < max_results]
+        # Topics still crowded out only hold part of their window, which would understate their volume
+        crowded = set(short) if full else set()
+        results = {}
+        for topic, items in buckets.items():
+            results[topic] = prepare_category_items(items)
+            if topic not in crowded:
+                self._observe_arxiv_volume(topic, results[topic])
+        return results
+
+    async def _fetch_arxiv_batch_into_cache(self, topics: List[str], max_results: int,
+                                            limit: Optional[asyncio.Semaphore] = None
+                                            ) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        async with limit or nullcontext():
+            buckets = await self.fetch_arxiv_batch(topics, max_results=max_results)
+        changed = [
+            item for topic, items in buckets.items()
+            if items and items is not self.category_cache.peek(('arxiv', topic, max_results))
+            for item in items
+        ]
+        await self.ingest(changed)
+        for topic, items in buckets.items():
+            key = ('arxiv', topic, max_results)
+            if items is None:
+                self.failed_fetches.set(key, True, size=0)
+                continue
+            self.failed_fetches.pop(key)
+            if items is self.category_cache.peek(key):
+                self.category_cache.touch(key)
+            else:
+                self._replace_category(key, items)
+        return buckets
+
+    async def _await_batch_bucket(self, batch_task: asyncio.Task, topic: str, max_results: int) -> List[Dict[str, Any]]:
+        buckets = await asyncio.shield(batch_task)
+        return self.category_cache.peek(('arxiv', topic, max_results), buckets.get(topic) or [])
+
+    def _start_arxiv_batches(self, topics: List[str], max_results: int,
+                             limit: Optional[asyncio.Semaphore] = None) -> List[asyncio.Task]:
+        """
+        Start batched refreshes for topics not already in flight. Each topic is registered as its
+        own in-flight category key, so single-topic callers join the batch instead of duplicating it.
+        With a limit, each batch holds one of its slots while it talks to arXiv.
+        """
+        pending = [t for t in topics if ('category', ('arxiv', t, max_results)) not in self._inflight]
+        tasks = []
+        for batch in self._plan_arxiv_batches(pending, max_results):
+            batch_task = self._start_flight(
+                ('arxiv-batch', tuple(batch), max_results),
+                lambda batch=batch: self._fetch_arxiv_batch_into_cache(batch, max_results, limit)
+            )
+            for topic in batch:
+                tasks.append(self._start_flight(
+                    ('category', ('arxiv', topic, max_results)),
+                    lambda topic=topic, batch_task=batch_task: self._await_batch_bucket(batch_task, topic, max_results)
+                ))
+        return tasks
+
+    async def refresh_arxiv_topics(self, topics: List[str], max_results: int = 10,
+                                   limit: Optional[asyncio.Semaphore] = None) -> None:
+        """
+        Refresh several arXiv categories using as few batched queries as possible; with a
+        limit, no more batches than it allows run at once
+        """
+        tasks = self._start_arxiv_batches(topics, max_results, limit)
+        if tasks:
+            await asyncio.shield(asyncio.gather(*tasks, return_exceptions=True))
+
+    async def _prefetch_arxiv_topics(self, topics: List[str], max_results: int) -> List[asyncio.Task]:
+        """
+        Warm topics from the database, then start batched refreshes: stale topics refresh in the
+        background, and the tasks for missing ones are returned for the caller to wait on.
+        """
+        if not settings.ARXIV_BATCH_QUERIES:
             return []
-        feed_items = []
+        if settings.FEED_ITEMS_PERSIST:
+            await asyncio.gather(*(
+                self._single_flight(('stored', ('arxiv', t, max_results)),
+                                    lambda t=t: self._load_stored_category('arxiv', t, max_results))
+                for t in topics if ('arxiv', t, max_results) not in self.category_cache
+            ))
+        now = datetime.now()
+        missing = [t for t in topics if ('arxiv', t, max_results) not in self.category_cache
+                   and ('arxiv', t, max_results) not in self.failed_fetches]
+        stale = [t for t in topics if ('arxiv', t, max_results) in self.category_cache
+                 and ('arxiv', t, max_results) not in self.failed_fetches
+                 and not self._is_fresh(self.category_cache, ('arxiv', t, max_results), now)]
+        if len(stale) > 1:
+            self._start_arxiv_batches(stale, max_results)
+        if len(missing) > 1:
+            return self._start_arxiv_batches(missing, max_results)
+        return []
+
+    async def fetch_arxiv_feeds(self, topics: List[str], max_results: int = 10) -> None:
+        """
+        Make sure each selected arXiv topic (by arxiv_topic_id) is in the category cache
+        """
+        if not topics:
+            return
+        batch_tasks = await self._prefetch_arxiv_topics(topics, max_results)
+        if batch_tasks:
+            await asyncio.shield(asyncio.gather(*batch_tasks, return_exceptions=True))
         tasks = []
         for topic in topics:
-            tasks.append(self.fetch_arxiv_api(topic, max_results=max_results))
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for result in results:
-                if isinstance(result, Exception):
-                    print(f"Error fetching arXiv: {result}")
-                else:
-                    feed_items.extend(result)
-        # Remove duplicates by link
-        seen = set()
-        unique = []
-        for item in feed_items:
-            if item['link'] not in seen:
-                seen.add(item['link'])
-                unique.append(item)
-        return unique
+            tasks.append(self.get_category_items('arxiv', topic, max_results=max_results))
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Error fetching arXiv: {result}")
+
+    async def refresh_user_categories(self, book_categories: List[str], arxiv_topics: List[str],
+                                      max_results: int = 10) -> None:
+        """
+        Re-fetch a user's categories that were fetched at least RSS_MANUAL_REFRESH_MIN_AGE seconds ago.
+        Each fetch joins any refresh of that category already in flight, and categories whose last
+        fetch failed wait out RSS_FAILURE_TTL, so repeated clicks cost upstream nothing extra.
+        A category whose content changed drops the user feeds built from it as usual.
+        """
+        def due(source: str, category: str) -> bool:
+            if (source, category, max_results) in self.failed_fetches:
+                return False
+            age = self.category_age(source, category, max_results)
+            return age is None or age >= settings.RSS_MANUAL_REFRESH_MIN_AGE
+
+        books = [c for c in book_categories if due('book', c)]
+        topics = [t for t in arxiv_topics if due('arxiv', t)]
+        if settings.ARXIV_BATCH_QUERIES and len(topics) > 1:
+            # Registers each topic's in-flight key, so refresh_category below joins the batches
+            self._start_arxiv_batches(topics, max_results)
+        await asyncio.gather(
+            *(self.refresh_category('book', c, max_results) for c in books),
+            *(self.refresh_category('arxiv', t, max_results) for t in topics),
+            return_exceptions=True
+        )
+
+    def _feed_key(self, user_email: str, book_categories: List[str], arxiv_topics: List[str], max_results: int) -> Tuple:
+        return (user_email, tuple(sorted(book_categories)), tuple(sorted(arxiv_topics)), max_results)
+
+    def get_cached_feeds(self, user_email: str, book_categories: List[str], arxiv_topics: List[str], max_results: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """The user's combined feed if it is cached, without fetching anything"""
+        return self.cache.get(self._feed_key(user_email, book_categories, arxiv_topics, max_results))
 
     async def get_feeds(self, user_email: str, book_categories: List[str], arxiv_topics: List[str], max_results: int = 10) -> List[Dict[str, Any]]:
-        cache_key = f"{user_email}:{','.join(sorted(book_categories))}:{','.join(sorted(arxiv_topics))}:{max_results}"
-        now = datetime.now()
-        if (cache_key in self.cache and cache_key in self.last_update and
-            (now - self.last_update[cache_key]).total_seconds() < settings.RSS_CACHE_TTL):
-            return self.cache[cache_key]
-        book_results, arxiv_results = await asyncio.gather(
+        cache_key = self._feed_key(user_email, book_categories, arxiv_topics, max_results)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        # Concurrent misses for the same feed wait on one assembly instead of each re-fetching
+        return await self._single_flight(
+            ('feed', cache_key),
+            lambda: self._build_feeds(cache_key, book_categories, arxiv_topics, max_results)
+        )
+
+    async def _build_feeds(self, cache_key: Tuple, book_categories: List[str], arxiv_topics: List[str], max_results: int) -> List[Dict[str, Any]]:
+        # Make sure every category is cached, fetching the missing ones
+        await asyncio.gather(
             self.fetch_book_feeds(book_categories, max_results=max_results),
             self.fetch_arxiv_feeds(arxiv_topics, max_results=max_results),
             return_exceptions=True
         )
-        if isinstance(book_results, Exception):
-            book_results = []
-        if isinstance(arxiv_results, Exception):
-            arxiv_results = []
-        combined = book_results + arxiv_results
-        combined = sorted(
-            combined,
-            key=lambda x: x.get('published', ''),
-            reverse=True
-        )
-        self.cache[cache_key] = combined
-        self.last_update[cache_key] = now
+        return self._store_feed(cache_key, book_categories, arxiv_topics, max_results)
+
+    def _store_feed(self, cache_key: Tuple, book_categories: List[str], arxiv_topics: List[str], max_results: int) -> List[Dict[str, Any]]:
+        # Assemble from the category cache and index the result without awaiting in between, so a
+        # category refreshed while we were fetching is either included here or invalidates this feed
+        combined = self._assemble_feed(book_categories, arxiv_topics, max_results)
+        # The items themselves are owned by the category cache; only the list is accounted here
+        self.cache.set(cache_key, combined, size=sys.getsizeof(combined))
+        self._index_feed(cache_key)
         return combined
 
+    async def iter_category_items(self, user_email: str, book_categories: List[str], arxiv_topics: List[str],
+                                  max_results: int = 10, timeout: Optional[float] = None
+                                  ) -> AsyncIterator[Tuple[str, str, Optional[List[Dict[str, Any]]]]]:
+        """
+        Yield (source, category, items) for each of a user's categories as soon as it is available,
+        fastest first. Categories still cold when the timeout runs out are yielded with items=None;
+        their fetches keep running in the background and land in the cache for the next request.
+        When every category arrived, the combined feed is cached as get_feeds would.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        await self._prefetch_arxiv_topics(arxiv_topics, max_results)
+        # Topics in a batch that is already running join it through their in-flight category key
+        pending = {}
+        for source, categories in (('book', book_categories), ('arxiv', arxiv_topics)):
+            for category in categories:
+                task = asyncio.ensure_future(self.get_category_items(source, category, max_results=max_results))
+                pending[task] = (source, category)
+        complete = True
+        try:
+            while pending:
+                remaining = None if deadline is None else max(deadline - loop.time(), 0)
+                done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    source, category = pending.pop(task)
+                    if task.exception() is not None:
+                        print(f"Error fetching {source} {category}: {task.exception()}")
+                        yield source, category, None
+                    else:
+                        yield source, category, task.result()
+            for task, (source, category) in list(pending.items()):
+                complete = False
+                # The deadline passed: fall back to whatever is cached, however old
+                yield source, category, self.category_cache.peek((source, category, max_results))
+        finally:
+            # Only the waiters are cancelled; the shared fetches underneath are shielded
+            for task in pending:
+                task.cancel()
+        if complete:
+            self._store_feed(self._feed_key(user_email, book_categories, arxiv_topics, max_results),
+                             book_categories, arxiv_topics, max_results)
+
+    def _assemble_feed(self, book_categories: List[str], arxiv_topics: List[str], max_results: int) -> List[Dict[str, Any]]:
+        lists = [self.category_cache.peek(('book', category, max_results), []) for category in book_categories]
+        lists += [self.category_cache.peek(('arxiv', topic, max_results), []) for topic in arxiv_topics]
+        return merge_newest_first(lists)
+
+    def _read_stored_feeds(self, book_categories: List[str], arxiv_topics: List[str], row_limit: int,
+                           limit: Optional[int]) -> List[Dict[str, Any]]:
+        with get_db_session() as db:
+            rows = FeedItem.latest_for_categories(db, book_categories, arxiv_topics, row_limit)
+            # Rows come back in feed order; the merge keeps one item per work across categories and editions
+            return merge_newest_first([[row.to_dict() for row in rows]], limit=limit)
+
+    async def get_stored_feeds(self, book_categories: List[str], arxiv_topics: List[str], max_results: int = 10,
+                               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Read a combined feed straight from the feed_items table, newest first, without calling upstream.
+        With a limit, only that many items are merged out of the rows read.
+        """
+        row_limit = max_results * (len(book_categories) + len(arxiv_topics))
+        if not row_limit:
+            return []
+        return await run_in_threadpool(self._read_stored_feeds, book_categories, arxiv_topics, row_limit, limit)
+
+    async def close(self):
+        """Cancel any fetches still in flight"""
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     def invalidate(self, user_email: str = None):
         if user_email:
-            keys_to_remove = [k for k in self.cache if k.startswith(f"{user_email}:")]
-            for key in keys_to_remove:
+            # Popping a key fires _unindex_feed, which mutates the index set, so iterate a copy
+            for key in list(self._user_feed_keys.get(user_email, ())):
                 self.cache.pop(key, None)
-                self.last_update.pop(key, None)
         else:
-            self.cache = {}
-            self.last_update = {}
+            self.cache.clear()
+            self.category_cache.clear()
+            self.failed_fetches.clear()
+
+    def invalidate_category(self, source: str, category: str, max_results: int = 10):
+        """Drop only the cached user feeds that include this category; they are reassembled on next access"""
+        for key in list(self._category_feed_keys.get((source, category, max_results), ())):
+            self.cache.pop(key, None)
+
+    def purge_expired(self) -> int:
+        """Actively drop expired entries from both cache layers"""
+        return self.cache.purge_expired() + self.category_cache.purge_expired()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "feeds": self.cache.stats(),
+            "categories": self.category_cache.stats(),
+            "inflight": len(self._inflight),
+            "failed": len(self.failed_fetches),
+            "events": self.events.stats(),
+            "search": feed_search_index.stats(),
+            "dedup": deduplicator.stats(),
+            "responses": response_cache.stats(),
+            "fragments": item_fragments.stats(),
+            "static": static_manifest.stats(),
+        }
 
 # Initialize the cache
 feed_cache = FeedCache()
 
+async def load_feed_items(user_email: str, book_categories: List[str], arxiv_topics: List[str],
+                          limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Feed items for a page, from the feed_items table or the in-memory cache depending on settings.
+    A limit bounds the merge of stored rows; the cached feed is merged in full once, since
+    /api/feed pages through it with cursors.
+    """
+    if settings.FEED_READ_FROM_DB:
+        return await feed_cache.get_stored_feeds(book_categories, arxiv_topics, limit=limit)
+    return await feed_cache.get_feeds(user_email, book_categories, arxiv_topics)
+
+# =====================
+# Background Feed Refresh
+# =====================
+class FeedRefreshScheduler:
+    """
+    Periodically refreshes every subscribed category, most popular first, so that
+    user requests are served from cache without waiting on upstream APIs.
+    """
+    def __init__(self, cache: FeedCache, interval: int, concurrency: int):
+        self.cache = cache
+        self.interval = interval
+        self.concurrency = concurrency
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.cache.close()
+
+    def _load_subscriptions(self) -> List[Tuple[str, str]]:
+        """(source, category) pairs ordered by number of subscribers, most popular first"""
+        with get_db_session() as db:
+            popular = [('book', cat, n) for cat, n in UserBookCategory.popular_categories(db)]
+            popular += [('arxiv', topic, n) for topic, n in UserArxivTopic.popular_topics(db)]
+        popular.sort(key=lambda row: row[2], reverse=True)
+        return [(source, category) for source, category, _ in popular]
+
+    async def refresh_once(self):
+        subscriptions = await run_in_threadpool(self._load_subscriptions)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        def due(source: str, category: str) -> bool:
+            # Skip entries that will still be fresh at the next pass
+            age = self.cache.category_age(source, category)
+            return age is None or age + self.interval >= settings.RSS_CACHE_TTL
+
+        async def refresh(source: str, category: str):
+            async with semaphore:
+                await self.cache.refresh_category(source, category)
+
+        due_subscriptions = [(s, c) for s, c in subscriptions if due(s, c)]
+        jobs = []
+        if settings.ARXIV_BATCH_QUERIES:
+            # The cache plans the OR-query batches itself, with the same max_results it fetches with
+            arxiv_due = [c for s, c in due_subscriptions if s == 'arxiv']
+            if arxiv_due:
+                jobs.append(self.cache.refresh_arxiv_topics(arxiv_due, limit=semaphore))
+            due_subscriptions = [(s, c) for s, c in due_subscriptions if s != 'arxiv']
+        jobs += [refresh(s, c) for s, c in due_subscriptions]
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Error in background feed refresh: {result}")
+
+    async def _run(self):
+        while True:
+            try:
+                self.cache.purge_expired()
+                if upstream.response_cache is not None:
+                    # Batched query URLs change with subscriptions, so unused responses pile up
+                    await run_in_threadpool(upstream.response_cache.prune, settings.RSS_CACHE_MAX_STALE)
+                await self.refresh_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Background feed refresh failed: {e}")
+            await asyncio.sleep(self.interval)
+
+refresh_scheduler = FeedRefreshScheduler(
+    feed_cache,
+    interval=settings.RSS_REFRESH_INTERVAL,
+    concurrency=settings.RSS_REFRESH_CONCURRENCY,
+)
+
+async def get_user_context(email: str) -> UserContext:
+    """Categories, topics and favourites of the logged-in user in one database round trip"""
+    async with get_async_db_session() as db:
+        return await load_user_context(db, email)
+
+def mark_favorites(feed_items: List[Dict[str, Any]], fav_dict: Mapping[str, str]) -> List[Dict[str, Any]]:
+    """
+    Return per-request copies of feed items annotated with the user's favourite state and
+    the display labels of their categories.
+    Cached items are shared between users, so they must never be mutated in place.
+    """
+    marked = []
+    for item in feed_items:
+        item = dict(item)
+        item['category_labels'] = taxonomy.category_labels(item)
+        if item['link'] in fav_dict:
+            item['is_favorite'] = True
+            item['favorite_id'] = fav_dict[item['link']]
+        else:
+            item['is_favorite'] = False
+        marked.append(item)
+    return marked
+
+# =====================
+# Streamed Home Page
+# =====================
+FEED_STREAM_MARKER = "<!--feed-stream-->"
+
+def _stream_script(call: str, *args) -> str:
+    """An inline script calling a page function; "<" is escaped so data can't close the script tag"""
+    encoded = ", ".join(json.dumps(arg).replace("<", "\\u003c") for arg in args)
+    return f"<script>{call}({encoded});</script>\n"
+
+async def stream_homepage(request: Request, ctx: UserContext) -> AsyncIterator[str]:
+    """
+    Send the page shell straight away, then each category's items as its fetch completes.
+    The browser merges them into feed order and keeps the first page; categories that are still
+    cold after HOME_STREAM_DEADLINE are left out and show up on the next load.
+    """
+    page = templates.get_template("rss_feed.html").render({
+        "request": request,
+        "streaming": True,
+        "stream_marker": FEED_STREAM_MARKER,
+        "feed_items": [],
+        "feed_page_size": settings.FEED_PAGE_SIZE,
+        "feed_source": "",
+        "user": ctx,
+        "book_categories": ctx.book_categories,
+        "arxiv_topics": ctx.arxiv_topics,
+        "favourites": ctx.favourites,
+        "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    })
+    head, tail = page.split(FEED_STREAM_MARKER, 1)
+    yield head
+    
+    lists = []
+    skipped = 0
+    cached = feed_cache.get_cached_feeds(ctx.email, ctx.book_categories, ctx.arxiv_topics)
+    if cached is not None:
+        lists.append(cached)
+        yield _stream_script("insertFeedItems", mark_favorites(cached[:settings.FEED_PAGE_SIZE], ctx.favourite_ids))
+    else:
+        async for source, category, items in feed_cache.iter_category_items(
+            ctx.email, ctx.book_categories, ctx.arxiv_topics, timeout=settings.HOME_STREAM_DEADLINE
+        ):
+            if items is None:
+                skipped += 1
+                continue
+            lists.append(items)
+            # Lists are sorted newest first, so only their heads can make it onto the first page
+            yield _stream_script("insertFeedItems", mark_favorites(items[:settings.FEED_PAGE_SIZE], ctx.favourite_ids))
+    # The page boundary only needs one item past the first page
+    _, next_cursor = feed_page(merge_newest_first(lists, limit=settings.FEED_PAGE_SIZE + 1), None, settings.FEED_PAGE_SIZE)
+    yield _stream_script("finishFeedStream", next_cursor, skipped)
+    yield tail
+
 # =====================
 # Routes
 # =====================
@@ -288,57 +1607,54 @@ async def auth_callback(request: Request, code: str, mode: str = "login"):
         "grant_type": "authorization_code",
     }
     try:
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(token_url, data=data)
-            token_data = token_response.json()
-            id_token = token_data.get("id_token")
-            if not id_token:
-                return HTMLResponse("<h2>Google authentication failed. Please try again.</h2>")
-            payload = verify_google_jwt(id_token)
-            if not payload:
-                return HTMLResponse("<h2>Invalid Google token. Please try again.</h2>")
-            email = payload.get("email")
-            if not email:
-                return HTMLResponse("<h2>Email not found in Google account.</h2>")            
-            request.session["user"] = email
-
-            # Handle admin differently
-            if email == settings.ADMIN_EMAIL:
-                with get_db_session() as db:
-                    # For admin, check if they exist and create if not
-                    admin_user = db.query(User).filter(User.email == email).first()
-                    if not admin_user and mode == "signup":
-                        # Create admin user
-                        User.create(db, email=email)
-                        # No need to force admin to select preferences
-                    
-                    # Redirect to admin panel regardless of login/signup
-                    return RedirectResponse(url="/admin")
+        token_response = await upstream.post(token_url, data=data)
+        token_data = token_response.json()
+        id_token = token_data.get("id_token")
+        if not id_token:
+            return HTMLResponse("<h2>Google authentication failed. Please try again.</h2>")
+        payload = await verify_google_jwt(id_token)
+        if not payload:
+            return HTMLResponse("<h2>Invalid Google token. Please try again.</h2>")
+        email = payload.get("email")
+        if not email:
+            return HTMLResponse("<h2>Email not found in Google account.</h2>")            
+        request.session["user"] = email
+
+        # Handle admin differently
+        if email == settings.ADMIN_EMAIL:
+            async with get_async_db_session() as db:
+                # For admin, check if they exist and create if not
+                admin_user = await User.get_by_email_async(db, email)
+                if not admin_user and mode == "signup":
+                    # Create admin user
+                    await User.create_async(db, email=email)
+                    # No need to force admin to select preferences
+                
+                # Redirect to admin panel regardless of login/signup
+                return RedirectResponse(url="/admin")
+        
+        async with get_async_db_session() as db:
+            # Find user by email
+            user = await User.get_by_email_async(db, email)
             
-            with get_db_session() as db:
-                # Find user by email
-                user = db.query(User).filter(User.email == email).first()
+            if mode == "signup":
+                if user:
+                    return HTMLResponse("<h2>User already exists. Please login.</h2>")
+                # Create new user with helper method
+                await User.create_async(db, email=email)
+                return RedirectResponse(url="/select-books")
+            else:
+                if not user:
+                    return HTMLResponse("<h2>No account found. Please signup first.</h2>")
                 
-                if mode == "signup":
-                    if user:
-                        return HTMLResponse("<h2>User already exists. Please login.</h2>")
-                    # Create new user with helper method
-                    User.create(db, email=email)
+                # Check if user has selected categories
+                if not await UserBookCategory.get_category_ids_async(db, email):
                     return RedirectResponse(url="/select-books")
-                else:
-                    if not user:
-                        return HTMLResponse("<h2>No account found. Please signup first.</h2>")
                     
-                    # Check if user has selected categories
-                    book_cat = db.query(UserBookCategory).filter(UserBookCategory.user_email == email).first()
-                    if not book_cat:
-                        return RedirectResponse(url="/select-books")
-                        
-                    arxiv_cat = db.query(UserArxivTopic).filter(UserArxivTopic.user_email == email).first()
-                    if not arxiv_cat:
-                        return RedirectResponse(url="/select-research")
-                        
-                    return RedirectResponse(url="/home")
+                if not await UserArxivTopic.get_topic_ids_async(db, email):
+                    return RedirectResponse(url="/select-research")
+                    
+                return RedirectResponse(url="/home")
     except Exception as e:
         logging.error(f"OAuth callback error: {e}")
         return HTMLResponse("<h2>Authentication error. Please try again later.</h2>")
@@ -356,50 +1672,60 @@ def admin_required(request: Request):
 # ADMIN PAGE
 # ===============
 @app.get("/admin", response_class=HTMLResponse)
-async def admin_page(request: Request, admin: str = Depends(admin_required)):
+async def admin_page(request: Request, page: int = 1, q: str = "", admin: str = Depends(admin_required)):
     try:
-        with get_db_session() as db:
-            # Eagerly load user data to prevent detached instance errors
-            users_list = []
-            for user in db.query(User).all():
-                users_list.append({
-                    "email": user.email,
-                    "created_at": user.created_at
-                })
-            
-            # Load all favorites and organize by user
-            all_favs = db.query(Favorite).all()
-            favs_by_user = {}
-            for fav in all_favs:
-                # Create a dictionary with the favorite data to prevent detached instance errors
-                fav_dict = {
-                    "id": fav.id,
-                    "title": fav.title,
-                    "type": fav.type,
-                    "link": fav.link,
-                    "date_published": fav.date_published
-                }
-                favs_by_user.setdefault(fav.user_email, []).append(fav_dict)
+        page = max(page, 1)
+        search = q.strip() or None
+        async with get_async_db_session() as db:
+            total = await User.count_async(db, search)
+            users_list = await User.page_with_favourite_counts_async(
+                db, offset=(page - 1) * settings.ADMIN_PAGE_SIZE, limit=settings.ADMIN_PAGE_SIZE, search=search
+            )
+            summary = await load_admin_summary(db)
         
         return templates.TemplateResponse("admin.html", {
             "request": request,
             "users": users_list,
-            "favs_by_user": favs_by_user,
+            "summary": summary,
+            "page": page,
+            "page_count": max((total + settings.ADMIN_PAGE_SIZE - 1) // settings.ADMIN_PAGE_SIZE, 1),
+            "total_users": total,
+            "q": q,
             "admin_email": settings.ADMIN_EMAIL
         })
     except Exception as e:
         logging.error(f"Admin page error: {e}")
         return HTMLResponse(f"<h2>Error loading admin page. Please try again later.</h2><p>Error: {str(e)}</p>")
 
+# ===============
+# ADMIN: USER FAVOURITES (loaded on demand)
+# ===============
+@app.get("/admin/user-favourites")
+async def admin_user_favourites(user_email: str, admin: str = Depends(admin_required)):
+    async with get_async_db_session() as db:
+        favs = await Favorite.get_for_user_async(db, user_email)
+    return JSONResponse(content={
+        "favourites": [
+            {
+                "id": fav.id,
+                "title": fav.title,
+                "type": fav.type,
+                "link": fav.link,
+                "date_published": fav.date_published
+            }
+            for fav in favs
+        ]
+    })
+
 # ===============
 # ADMIN: DELETE USER
 # ===============
 @app.post("/admin/delete-user")
 async def admin_delete_user(request: Request, user_email: str = Form(...), admin: str = Depends(admin_required)):
     try:
-        with get_db_session() as db:
+        async with get_async_db_session() as db:
             # Check if user exists
-            user = db.query(User).filter(User.email == user_email).first()
+            user = await User.get_by_email_async(db, user_email)
             if not user:
                 return HTMLResponse("<h2>Error: User not found.</h2><p><a href='/admin'>Return to Admin Panel</a></p>")
                 
@@ -408,11 +1734,7 @@ async def admin_delete_user(request: Request, user_email: str = Form(...), admin
                 return HTMLResponse("<h2>Error: Cannot delete admin user.</h2><p><a href='/admin'>Return to Admin Panel</a></p>")
                 
             # Remove all user data
-            db.query(Favorite).filter(Favorite.user_email == user_email).delete()
-            db.query(UserBookCategory).filter(UserBookCategory.user_email == user_email).delete()
-            db.query(UserArxivTopic).filter(UserArxivTopic.user_email == user_email).delete()
-            db.query(User).filter(User.email == user_email).delete()
-            db.commit()
+            await User.delete_with_data_async(db, user_email)
             
         # Invalidate cache for this user
         feed_cache.invalidate(user_email=user_email)
@@ -423,197 +1745,162 @@ async def admin_delete_user(request: Request, user_email: str = Form(...), admin
             f"<h2>Error deleting user.</h2><p>Error: {str(e)}</p><p><a href='/admin'>Return to Admin Panel</a></p>"
         )
 
+# ===============
+# ADMIN: CACHE STATS
+# ===============
+@app.get("/admin/cache-stats")
+async def admin_cache_stats(admin: str = Depends(admin_required)):
+    return JSONResponse(content=feed_cache.stats())
+
+def select_page_response(request: Request, template_name: str, context: Dict[str, Any],
+                         tax: taxonomy.Taxonomy) -> Response:
+    """
+    A category selection page. It is the same for every user, so it is rendered once per
+    template, taxonomy and asset version and then served from the response cache or answered with a 304.
+    """
+    etag = make_etag(template_name, template_version(template_name), tax.version, static_manifest.version)
+    return conditional_response(request, etag, lambda: render_template(template_name, context),
+                                "text/html; charset=utf-8")
+
+def _unknown_ids_error(kind: str, invalid: List[str]) -> str:
+    shown = ", ".join(invalid[:5]) + (", ..." if len(invalid) > 5 else "")
+    return f"Unknown {kind}: {shown}"
+
 @app.get("/select-books", response_class=HTMLResponse)
 async def select_books_get(request: Request, user: str = Depends(get_current_user)):
-    return templates.TemplateResponse("select_books.html", {"request": request, "book_categories": BOOK_CATEGORIES})
+    return select_page_response(request, "select_books.html", {"book_categories": taxonomy.BOOKS.groups}, taxonomy.BOOKS)
 
 @app.post("/select-books")
 async def select_books_post(request: Request, user: str = Depends(get_current_user)):
     form = await request.form()
-    books = form.getlist("books")
+    books, invalid = taxonomy.BOOKS.validate(form.getlist("books"))
+    if invalid:
+        return templates.TemplateResponse(
+            "select_books.html",
+            {"request": request, "book_categories": taxonomy.BOOKS.groups,
+             "error": _unknown_ids_error("book categories", invalid)},
+            status_code=400
+        )
     if not books:
         return templates.TemplateResponse(
             "select_books.html",
-            {"request": request, "book_categories": BOOK_CATEGORIES, "error": "Please select at least one book category."}
+            {"request": request, "book_categories": taxonomy.BOOKS.groups, "error": "Please select at least one book category."}
         )
     
-    with get_db_session() as db:
+    async with get_async_db_session() as db:
         # Use the helper method to update user's book categories
-        UserBookCategory.add_categories_for_user(db, user, books)
+        await UserBookCategory.add_categories_for_user_async(db, user, books)
         
     feed_cache.invalidate(user_email=user)
     return RedirectResponse(url="/select-research", status_code=303)
 
 @app.get("/select-research", response_class=HTMLResponse)
 async def select_research_get(request: Request, user: str = Depends(get_current_user)):
-    return templates.TemplateResponse("select_research.html", {"request": request, "research_categories": ARXIV_TAXONOMY})
+    return select_page_response(request, "select_research.html", {"research_categories": taxonomy.ARXIV.groups}, taxonomy.ARXIV)
 
 @app.post("/select-research")
 async def select_research_post(request: Request, user: str = Depends(get_current_user)):
     form = await request.form()
-    arxiv = form.getlist("arxiv")
+    arxiv, invalid = taxonomy.ARXIV.validate(form.getlist("arxiv"))
+    if invalid:
+        return templates.TemplateResponse(
+            "select_research.html",
+            {"request": request, "research_categories": taxonomy.ARXIV.groups,
+             "error": _unknown_ids_error("research categories", invalid)},
+            status_code=400
+        )
     if not arxiv:
         return templates.TemplateResponse(
             "select_research.html",
-            {"request": request, "research_categories": ARXIV_TAXONOMY, "error": "Please select at least one research category."}
+            {"request": request, "research_categories": taxonomy.ARXIV.groups, "error": "Please select at least one research category."}
         )
-    with get_db_session() as db:
+    async with get_async_db_session() as db:
         # Use the helper method to update user's arxiv topics
-        UserArxivTopic.add_topics_for_user(db, user, arxiv)
+        await UserArxivTopic.add_topics_for_user_async(db, user, arxiv)
     feed_cache.invalidate(user_email=user)
     return RedirectResponse(url="/home", status_code=303)
 
 @app.get("/home", response_class=HTMLResponse)
 async def homepage(request: Request, user: str = Depends(get_current_user)):
-    with get_db_session() as db:
-        user_obj = db.query(User).filter(User.email == user).first()
-        book_cats = [category.book_category_id for category in user_obj.book_categories]
-        arxiv_cats = [topic.arxiv_topic_id for topic in user_obj.arxiv_topics]
-        favs = user_obj.favorites
-        favs_data = [
-            {
-                "id": fav.id,
-                "title": fav.title,
-                "type": fav.type,
-                "link": fav.link,
-                "date_published": fav.date_published
-            }
-            for fav in favs
-        ]
-        fav_dict = {f"{fav['link']}_{fav['title']}": fav['id'] for fav in favs_data}
-    feed_items = await feed_cache.get_feeds(user, book_cats, arxiv_cats)
-    for item in feed_items:
-        item_key = f"{item['link']}_{item['title']}"
-        if item_key in fav_dict:
-            item['is_favorite'] = True
-            item['favorite_id'] = fav_dict[item_key]
-        else:
-            item['is_favorite'] = False
-    return templates.TemplateResponse("rss_feed.html", {
-        "request": request,
-        "feed_items": feed_items,
-        "user": user_obj,
-        "book_categories": book_cats,
-        "arxiv_topics": arxiv_cats,
-        "favourites": favs_data,
-        "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    ctx = await get_user_context(user)
+    if not ctx.exists:
+        # Account deleted while the session was still open
+        return RedirectResponse(url="/logout", status_code=303)
+    if (settings.HOME_STREAMING and not settings.FEED_READ_FROM_DB
+            and feed_cache.get_cached_feeds(user, ctx.book_categories, ctx.arxiv_topics) is None):
+        # Tell proxies not to buffer, or the early flush is lost
+        return StreamingResponse(stream_homepage(request, ctx), media_type="text/html",
+                                 headers={"X-Accel-Buffering": "no"})
+    # Only the first page is rendered, plus one item to tell whether there is a next one;
+    # the rest is fetched from /api/feed while scrolling
+    feed_items = await load_feed_items(user, ctx.book_categories, ctx.arxiv_topics, limit=settings.FEED_PAGE_SIZE + 1)
+    feed_items, next_cursor = feed_page(feed_items, None, settings.FEED_PAGE_SIZE)
+    feed_items = mark_favorites(feed_items, ctx.favourite_ids)
+    return feed_page_response(request, "rss_feed.html", ctx, feed_items, next_cursor, {
+        "feed_source": "",
+        "book_categories": ctx.book_categories,
+        "arxiv_topics": ctx.arxiv_topics,
     })
 
 @app.get("/books", response_class=HTMLResponse)
 async def books_feed(request: Request, user: str = Depends(get_current_user)):
-    with get_db_session() as db:
-        user_obj = db.query(User).filter(User.email == user).first()
-        book_cats = [category.book_category_id for category in user_obj.book_categories]
-        favs = user_obj.favorites
-        favs_data = [
-            {
-                "id": fav.id,
-                "title": fav.title,
-                "type": fav.type,
-                "link": fav.link,
-                "date_published": fav.date_published
-            }
-            for fav in favs
-        ]
-        fav_dict = {f"{fav['link']}_{fav['title']}": fav['id'] for fav in favs_data}
-    feed_items = await feed_cache.get_feeds(user, book_cats, [])
-    book_items = [item for item in feed_items if item['type'] == 'book']
-    for item in book_items:
-        item_key = f"{item['link']}_{item['title']}"
-        if item_key in fav_dict:
-            item['is_favorite'] = True
-            item['favorite_id'] = fav_dict[item_key]
-        else:
-            item['is_favorite'] = False
-    return templates.TemplateResponse("books_feed.html", {
-        "request": request,
-        "feed_items": book_items,
-        "user": user_obj,
-        "favourites": favs_data,
-        "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    })
+    ctx = await get_user_context(user)
+    if not ctx.exists:
+        # Account deleted while the session was still open
+        return RedirectResponse(url="/logout", status_code=303)
+    feed_items = await load_feed_items(user, ctx.book_categories, [], limit=settings.FEED_PAGE_SIZE + 1)
+    book_items, next_cursor = feed_page([item for item in feed_items if item['type'] == 'book'], None, settings.FEED_PAGE_SIZE)
+    book_items = mark_favorites(book_items, ctx.favourite_ids)
+    return feed_page_response(request, "books_feed.html", ctx, book_items, next_cursor, {"feed_source": "book"})
 
 @app.get("/research", response_class=HTMLResponse)
 async def research_feed(request: Request, user: str = Depends(get_current_user)):
-    with get_db_session() as db:
-        user_obj = db.query(User).filter(User.email == user).first()
-        arxiv_cats = [topic.arxiv_topic_id for topic in user_obj.arxiv_topics]
-        favs = user_obj.favorites
-        favs_data = [
-            {
-                "id": fav.id,
-                "title": fav.title,
-                "type": fav.type,
-                "link": fav.link,
-                "date_published": fav.date_published
-            }
-            for fav in favs
-        ]
-        fav_dict = {f"{fav['link']}_{fav['title']}": fav['id'] for fav in favs_data}
-    feed_items = await feed_cache.get_feeds(user, [], arxiv_cats)
-    research_items = [item for item in feed_items if item['type'] == 'arxiv']
-    for item in research_items:
-        item_key = f"{item['link']}_{item['title']}"
-        if item_key in fav_dict:
-            item['is_favorite'] = True
-            item['favorite_id'] = fav_dict[item_key]
-        else:
-            item['is_favorite'] = False
-    return templates.TemplateResponse("research_feed.html", {
-        "request": request,
-        "feed_items": research_items,
-        "user": user_obj,
-        "favourites": favs_data,
-        "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    })
+    ctx = await get_user_context(user)
+    if not ctx.exists:
+        # Account deleted while the session was still open
+        return RedirectResponse(url="/logout", status_code=303)
+    feed_items = await load_feed_items(user, [], ctx.arxiv_topics, limit=settings.FEED_PAGE_SIZE + 1)
+    research_items, next_cursor = feed_page([item for item in feed_items if item['type'] == 'arxiv'], None, settings.FEED_PAGE_SIZE)
+    research_items = mark_favorites(research_items, ctx.favourite_ids)
+    return feed_page_response(request, "research_feed.html", ctx, research_items, next_cursor, {"feed_source": "arxiv"})
 
 @app.get("/favourites", response_class=HTMLResponse)
 async def favourites_page(request: Request, user: str = Depends(get_current_user)):
-    with get_db_session() as db:
-        user_obj = db.query(User).filter(User.email == user).first()
-        favs = user_obj.favorites
-        feed_items = [
-            {
-                "id": fav.id,
-                "title": fav.title,
-                "type": fav.type,
-                "link": fav.link,
-                "published": fav.date_published,  # Changed key to match expected format
-                "is_favorite": True,
-                "category": fav.type.capitalize()  # Added category field
-            }
-            for fav in favs
-        ]
+    ctx = await get_user_context(user)
+    if not ctx.exists:
+        # Account deleted while the session was still open
+        return RedirectResponse(url="/logout", status_code=303)
+    feed_items = [
+        {
+            "id": fav.id,
+            "title": fav.title,
+            "type": fav.type,
+            "link": fav.link,
+            "published": fav.date_published,  # Changed key to match expected format
+            "is_favorite": True,
+            "category": fav.type.capitalize()  # Added category field
+        }
+        for fav in ctx.favourites
+    ]
     return templates.TemplateResponse("favourites.html", {
         "request": request,
         "feed_items": feed_items,  # Changed key from favourites to feed_items
         "favourites": feed_items,  # Keep this for backward compatibility
-        "user": user_obj,
+        "user": ctx,
         "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     })
 
 @app.post("/favourite")
 async def add_favourite(request: Request, title: str = Form(...), type: str = Form(...), link: str = Form(...), date_published: str = Form(...), user: str = Depends(get_current_user)):
-    import uuid
     from urllib.parse import unquote
       # URL decode the parameters if needed
     title = unquote(title)
     link = unquote(link)
     date_published = unquote(date_published)
     
-    with get_db_session() as db:
-        # Check if this item is already in favorites using ORM
-        existing = db.query(Favorite).filter(
-            (Favorite.user_email == user) & 
-            (Favorite.title == title) & 
-            (Favorite.link == link)
-        ).first()
-        
-        if existing:
-            return {"status": "exists", "id": existing.id}
-        
-        # Use the helper method to add a favorite
-        fav = Favorite.add_favorite(
+    async with get_async_db_session() as db:
+        # A single INSERT ... ON CONFLICT; an existing favourite of the same link is returned as is
+        fav_id, created = await Favorite.add_favorite_async(
             db,
             user_email=user,
             title=title,
@@ -621,13 +1908,16 @@ async def add_favourite(request: Request, title: str = Form(...), type: str = Fo
             link=link,
             date_published=date_published
         )
-        return {"status": "ok", "id": fav.id}
+        if created:
+            favourite_search_indexes.pop(user)
+        return {"status": "ok" if created else "exists", "id": fav_id}
 
 @app.post("/unfavourite")
 async def remove_favourite(request: Request, fav_id: str = Form(...), user: str = Depends(get_current_user)):
-    with get_db_session() as db:
+    async with get_async_db_session() as db:
         # Use the helper method to remove a favorite
-        Favorite.remove_favorite(db, fav_id, user)
+        await Favorite.remove_favorite_async(db, fav_id, user)
+    favourite_search_indexes.pop(user)
     return {"status": "ok"}
 
 # =====================
@@ -635,36 +1925,115 @@ async def remove_favourite(request: Request, fav_id: str = Form(...), user: str
 # =====================
 @app.get("/api/refresh-feeds")
 async def refresh_feeds(request: Request, user: str = Depends(get_current_user)):
-    # Invalidate the cache for this user to force a refresh
-    feed_cache.invalidate(user_email=user)
+    ctx = await get_user_context(user)
     
-    with get_db_session() as db:
-        # Fetch user and related data using ORM relationships
-        user_obj = db.query(User).filter(User.email == user).first()
-        
-        # Extract book categories and arxiv topics
-        book_cats = [category.book_category_id for category in user_obj.book_categories]
-        arxiv_cats = [topic.arxiv_topic_id for topic in user_obj.arxiv_topics]
-        
-        # Get favorites and create lookup dict
-        fav_dict = {f"{fav.link}_{fav.title}": fav.id for fav in user_obj.favorites}
+    # Re-fetch the user's categories that aren't brand new; changed ones invalidate the user's feed
+    await feed_cache.refresh_user_categories(ctx.book_categories, ctx.arxiv_topics)
     
-    # Get fresh feeds
-    feed_items = await feed_cache.get_feeds(user, book_cats, arxiv_cats)
+    feed_items = await feed_cache.get_feeds(user, ctx.book_categories, ctx.arxiv_topics)
+    feed_items, next_cursor = feed_page(feed_items, None, settings.FEED_PAGE_SIZE)
     
     # Mark items that are in favorites
-    for item in feed_items:
-        item_key = f"{item['link']}_{item['title']}"
-        if item_key in fav_dict:
-            item['is_favorite'] = True
-            item['favorite_id'] = fav_dict[item_key]
-        else:
-            item['is_favorite'] = False
+    feed_items = mark_favorites(feed_items, ctx.favourite_ids)
     
-    return JSONResponse(content={
+    # An unchanged feed keeps its ETag, so last_updated is when its content last changed
+    etag = make_etag("refresh-feeds", user, feed_items, next_cursor)
+    return conditional_response(request, etag, lambda: json_body({
         "feed_items": feed_items,
+        "next_cursor": next_cursor,
         "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    })
+    }), "application/json")
+
+@app.get("/api/feed")
+async def feed_api(request: Request, cursor: Optional[str] = None, limit: Optional[int] = None,
+                   source: Optional[str] = None, user: str = Depends(get_current_user)):
+    """
+    One page of the user's combined feed, newest first. Pass the returned next_cursor to get
+    the following page; source=book or source=arxiv restricts the feed to one source.
+    """
+    if source not in (None, "", "book", "arxiv"):
+        raise HTTPException(status_code=400, detail="source must be 'book' or 'arxiv'")
+    limit = min(max(limit or settings.FEED_PAGE_SIZE, 1), settings.FEED_PAGE_MAX)
+    ctx = await get_user_context(user)
+    book_categories = ctx.book_categories if source in (None, "", "book") else ()
+    arxiv_topics = ctx.arxiv_topics if source in (None, "", "arxiv") else ()
+    feed_items = await load_feed_items(user, book_categories, arxiv_topics)
+    try:
+        page, next_cursor = feed_page(feed_items, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    page = mark_favorites(page, ctx.favourite_ids)
+    etag = make_etag("feed", user, page, next_cursor)
+    return conditional_response(request, etag, lambda: json_body({
+        "feed_items": page,
+        "next_cursor": next_cursor,
+    }), "application/json")
+
+@app.get("/api/search")
+async def search(q: str, limit: Optional[int] = None, source: Optional[str] = None,
+                 user: str = Depends(get_current_user)):
+    """
+    Ranked full-text search over titles, authors, abstracts and categories of every ingested item,
+    and over the user's favourites. Answered from the in-process index, never from upstream.
+    """
+    if source not in (None, "", "book", "arxiv"):
+        raise HTTPException(status_code=400, detail="source must be 'book' or 'arxiv'")
+    limit = min(max(limit or 20, 1), settings.SEARCH_MAX_RESULTS)
+    ctx = await get_user_context(user)
+    
+    def accept_item(payload) -> bool:
+        return not source or payload[1] == source
+    
+    item_results = feed_search_index.search(q, limit, accept=accept_item)
+    hydrated = await hydrate_search_results([payload for payload, _ in item_results])
+    # Items gone from both the cache and feed_items since they were indexed are left out
+    found = [(item, score) for item, (_, score) in zip(hydrated, item_results) if item is not None]
+    feed_items = mark_favorites([item for item, _ in found], ctx.favourite_ids)
+    for item, (_, score) in zip(feed_items, found):
+        item['score'] = score
+    
+    fav_results = favourite_search_index(ctx).search(
+        q, limit, accept=lambda fav: not source or fav.type == source
+    )
+    return {
+        "query": q,
+        "feed_items": feed_items,
+        "favourites": [dict(fav._asdict(), score=score) for fav, score in fav_results],
+    }
+
+@app.get("/api/feed-events")
+async def feed_events(request: Request, source: Optional[str] = None, user: str = Depends(get_current_user)):
+    """
+    Server-Sent Events stream of items newly ingested for the user's categories, so open pages
+    update as background refreshes land instead of re-fetching everything on demand.
+    Each "items" event carries a JSON list of items, newest first.
+    """
+    if source not in (None, "", "book", "arxiv"):
+        raise HTTPException(status_code=400, detail="source must be 'book' or 'arxiv'")
+    ctx = await get_user_context(user)
+    topics = []
+    if source in (None, "", "book"):
+        topics += [('book', category) for category in ctx.book_categories]
+    if source in (None, "", "arxiv"):
+        topics += [('arxiv', topic) for topic in ctx.arxiv_topics]
+    
+    async def event_stream():
+        with feed_cache.events.subscribe(topics) as subscription:
+            # Browsers reconnect after 5 seconds if the stream drops
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    new_items = await subscription.get(timeout=settings.SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                # Favourites may have changed since the stream opened; events are rare, so re-read them
+                current = await get_user_context(user)
+                payload = json.dumps(mark_favorites(new_items, current.favourite_ids))
+                yield f"event: items\ndata: {payload}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 # =====================
 # View Tracking for Analytics
@@ -0,0 +1,80 @@
+import asyncio
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+
+# =====================
+# In-Process Publish / Subscribe
+# =====================
+class Subscription:
+    """
+    One subscriber's bounded message queue. A subscriber that falls behind loses its
+    oldest messages rather than holding memory for the publisher.
+    """
+    def __init__(self, hub: "PubSub", topics: Iterable[Hashable], max_queue: int):
+        self.hub = hub
+        self.topics = frozenset(topics)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def put(self, message: Any) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout: Optional[float] = None) -> Any:
+        """Next message; raises asyncio.TimeoutError if none arrives within timeout"""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class PubSub:
+    """Fan-out of messages to the subscribers of each topic; delivery never blocks the publisher"""
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._subscribers: Dict[Hashable, Set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+
+    def subscribe(self, topics: Iterable[Hashable]) -> Subscription:
+        subscription = Subscription(self, topics, self.max_queue)
+        for topic in subscription.topics:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for topic in subscription.topics:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    def has_subscribers(self, topic: Hashable) -> bool:
+        return topic in self._subscribers
+
+    def publish(self, topic: Hashable, message: Any) -> int:
+        """Queue message for every subscriber of topic; returns how many received it"""
+        subscribers = self._subscribers.get(topic, ())
+        for subscription in subscribers:
+            subscription.put(message)
+        self.published += 1
+        self.delivered += len(subscribers)
+        return len(subscribers)
+
+    def stats(self) -> Dict[str, Any]:
+        subscriptions = {s for subscribers in self._subscribers.values() for s in subscribers}
+        return {
+            "topics": len(self._subscribers),
+            "subscriptions": len(subscriptions),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": sum(s.dropped for s in subscriptions),
+        }
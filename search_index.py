@@ -0,0 +1,167 @@
+import math
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# =====================
+# Tokenization
+# =====================
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_STOP_WORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the this to was were with".split()
+)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased word tokens of a text, with HTML tags and common stop words removed"""
+    if not text:
+        return []
+    words = _TOKEN_RE.findall(_TAG_RE.sub(" ", text).lower())
+    return [w for w in words if w not in _STOP_WORDS]
+
+# =====================
+# In-Process Inverted Index
+# =====================
+class SearchIndex:
+    """
+    Inverted index ranked with BM25. Documents are added and removed incrementally; the
+    last query term also matches as a prefix, so results show up while the user is typing.
+    Holds at most max_docs documents, dropping the least recently added first.
+    """
+    K1 = 1.2
+    B = 0.75
+    MAX_PREFIX_TERMS = 50
+
+    def __init__(self, field_weights: Dict[str, float], max_docs: int = 50000):
+        self.field_weights = field_weights
+        self.max_docs = max_docs
+        # doc id -> (payload, weighted term frequencies, weighted length)
+        self._docs: "OrderedDict[Hashable, Tuple[Any, Dict[str, float], float]]" = OrderedDict()
+        self._postings: Dict[str, Dict[Hashable, float]] = {}
+        self._total_length = 0.0
+        # Sorted vocabulary for prefix lookups, rebuilt lazily after the terms change
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._docs
+
+    def add(self, doc_id: Hashable, fields: Dict[str, Optional[str]], payload: Any = None,
+            oldest: bool = False) -> None:
+        """
+        Index a document, replacing any previous version with the same id. With oldest, a new
+        document is treated as older than every indexed one, so it is the first to be dropped,
+        and a replaced one keeps its place.
+        """
+        previous = self._docs.get(doc_id)
+        if oldest and previous is not None:
+            self._unindex(doc_id, previous)
+        else:
+            self.remove(doc_id)
+            previous = None
+        frequencies: Dict[str, float] = {}
+        for field, weight in self.field_weights.items():
+            for term in tokenize(fields.get(field)):
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+        length = sum(frequencies.values())
+        self._docs[doc_id] = (payload, frequencies, length)
+        if oldest and previous is None:
+            self._docs.move_to_end(doc_id, last=False)
+        self._total_length += length
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._vocabulary_dirty = True
+            postings[doc_id] = frequency
+        while len(self._docs) > self.max_docs:
+            self.remove(next(iter(self._docs)))
+
+    def remove(self, doc_id: Hashable) -> bool:
+        entry = self._docs.pop(doc_id, None)
+        if entry is None:
+            return False
+        self._unindex(doc_id, entry)
+        return True
+
+    def _unindex(self, doc_id: Hashable, entry: Tuple[Any, Dict[str, float], float]) -> None:
+        _, frequencies, length = entry
+        self._total_length -= length
+        for term in frequencies:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                self._vocabulary_dirty = True
+
+    def get(self, doc_id: Hashable, default: Any = None) -> Any:
+        entry = self._docs.get(doc_id)
+        return default if entry is None else entry[0]
+
+    def _expand(self, term: str) -> List[str]:
+        """Indexed terms starting with term, shortest first"""
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        matches = []
+        i = bisect_left(self._vocabulary, term)
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(term):
+            matches.append(self._vocabulary[i])
+            i += 1
+        matches.sort(key=len)
+        return matches[:self.MAX_PREFIX_TERMS]
+
+    def search(self, query: str, limit: int = 20,
+               accept: Optional[Callable[[Any], bool]] = None) -> List[Tuple[Any, float]]:
+        """
+        (payload, score) pairs of the documents containing every query term, best first.
+        Payloads rejected by accept are skipped without counting towards limit.
+        """
+        terms = tokenize(query)
+        if not terms or not self._docs:
+            return []
+        doc_count = len(self._docs)
+        average_length = self._total_length / doc_count or 1.0
+        scores: Optional[Dict[Hashable, float]] = None
+        for position, term in enumerate(terms):
+            # Only the term being typed is completed; earlier ones must match exactly
+            candidates = self._expand(term) if position == len(terms) - 1 else [term]
+            term_scores: Dict[Hashable, float] = {}
+            for candidate in candidates:
+                postings = self._postings.get(candidate)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                # Completions rank below exact matches of the same term
+                boost = 1.0 if candidate == term else 0.5
+                for doc_id, frequency in postings.items():
+                    if scores is not None and doc_id not in scores:
+                        continue
+                    length = self._docs[doc_id][2]
+                    norm = frequency + self.K1 * (1 - self.B + self.B * length / average_length)
+                    score = boost * idf * frequency * (self.K1 + 1) / norm
+                    if score > term_scores.get(doc_id, 0.0):
+                        term_scores[doc_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc_id: scores[doc_id] + s for doc_id, s in term_scores.items()}
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
+        results = []
+        for doc_id, score in ranked:
+            payload = self._docs[doc_id][0]
+            if accept is None or accept(payload):
+                results.append((payload, round(score, 4)))
+                if len(results) >= limit:
+                    break
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {"documents": len(self._docs), "terms": len(self._postings), "max_documents": self.max_docs}
@@ -0,0 +1,133 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+try:
+    import brotli
+except ImportError:  # Optional; assets are precompressed with gzip only
+    brotli = None
+
+# =====================
+# Content Negotiation
+# =====================
+def preferred_encoding(accept_encoding: str, available: Iterable[str]) -> Optional[str]:
+    """First of available (in order of preference) that an Accept-Encoding header allows"""
+    accepted = set()
+    for token in accept_encoding.split(","):
+        coding, _, params = token.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    for encoding in available:
+        if encoding in accepted:
+            return encoding
+    return None
+
+# =====================
+# Fingerprinted Asset Manifest
+# =====================
+class StaticAsset(NamedTuple):
+    path: str
+    hashed_path: str
+    media_type: str
+    etag: str
+    # content coding (None for identity) -> body
+    bodies: Dict[Optional[str], bytes]
+
+
+class AssetManifest:
+    """
+    Content-hashed names for every file under a static directory, built once at startup.
+    "style.css" becomes "style.<hash>.css", so a changed file gets a new URL and the old one
+    can be cached forever. Bodies are kept in memory with gzip/brotli variants precompressed.
+    """
+    def __init__(self, directory: str, compress_min_size: int = 256):
+        self.directory = directory
+        self.compress_min_size = compress_min_size
+        self._by_path: Dict[str, StaticAsset] = {}
+        self._by_hashed: Dict[str, StaticAsset] = {}
+        # Changes whenever any asset does; pages linking assets include it in their validators
+        self.version = ""
+
+    def build(self) -> "AssetManifest":
+        by_path = {}
+        for root, _, files in os.walk(self.directory):
+            for filename in sorted(files):
+                full_path = os.path.join(root, filename)
+                path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+                with open(full_path, "rb") as f:
+                    body = f.read()
+                by_path[path] = self._asset(path, body)
+        self._by_path = by_path
+        self._by_hashed = {asset.hashed_path: asset for asset in by_path.values()}
+        self.version = hashlib.sha256(" ".join(sorted(self._by_hashed)).encode("utf-8")).hexdigest()[:12]
+        return self
+
+    def _asset(self, path: str, body: bytes) -> StaticAsset:
+        digest = hashlib.sha256(body).hexdigest()[:12]
+        stem, ext = os.path.splitext(path)
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if media_type.startswith("text/") or media_type == "application/javascript":
+            media_type += "; charset=utf-8"
+        bodies = {None: body}
+        if len(body) >= self.compress_min_size:
+            bodies["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                bodies["br"] = brotli.compress(body, quality=11)
+        return StaticAsset(path, f"{stem}.{digest}{ext}", media_type, f'"{digest}"', bodies)
+
+    def url_path(self, path: str) -> str:
+        """Fingerprinted name of an asset, or path unchanged if it isn't in the manifest"""
+        asset = self._by_path.get(path.lstrip("/"))
+        return asset.hashed_path if asset is not None else path
+
+    def lookup(self, hashed_path: str) -> Optional[StaticAsset]:
+        return self._by_hashed.get(hashed_path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "assets": len(self._by_path),
+            "bytes": sum(len(asset.bodies[None]) for asset in self._by_path.values()),
+            "compressed_bytes": sum(
+                len(body) for asset in self._by_path.values() for coding, body in asset.bodies.items() if coding
+            ),
+        }
+
+# =====================
+# Immutable Static Files
+# =====================
+class FingerprintedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves manifest assets from memory under their fingerprinted names, with
+    the best precompressed variant and Cache-Control: immutable. Plain names fall through to
+    the regular, revalidated file serving.
+    """
+    IMMUTABLE = "public, max-age=31536000, immutable"
+
+    def __init__(self, *, manifest: AssetManifest, **kwargs):
+        super().__init__(**kwargs)
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        asset = self.manifest.lookup(path.replace(os.sep, "/"))
+        if asset is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+        headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]}
+        encoding = preferred_encoding(headers.get("accept-encoding", ""), [c for c in ("br", "gzip") if c in asset.bodies])
+        response_headers = {"Cache-Control": self.IMMUTABLE, "Vary": "Accept-Encoding",
+                            "ETag": asset.etag if encoding is None else f'{asset.etag[:-1]}-{encoding}"'}
+        if asset.etag[1:-1] in headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=response_headers)
+        if encoding is not None:
+            response_headers["Content-Encoding"] = encoding
+        body = asset.bodies[encoding]
+        if scope["method"] == "HEAD":
+            response_headers["Content-Length"] = str(len(body))
+            body = b""
+        return Response(body, media_type=asset.media_type, headers=response_headers)
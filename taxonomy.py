@@ -0,0 +1,66 @@
+import hashlib
+import json
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from constants import BOOK_CATEGORIES, ARXIV_TAXONOMY
+
+# =====================
+# Flat Taxonomy Indexes
+# =====================
+class Taxonomy:
+    """
+    Flat indexes over a {group: {id: label}} taxonomy, built once: id -> label, id -> group and
+    the set of valid ids, so lookups and validation don't walk the nested dicts.
+    """
+    def __init__(self, groups: Mapping[str, Mapping[str, str]]):
+        self.groups = groups
+        self.labels: Dict[str, str] = {}
+        self.group_of: Dict[str, str] = {}
+        for group, entries in groups.items():
+            for id_, label in entries.items():
+                self.labels[id_] = label
+                self.group_of[id_] = group
+        self.ids = frozenset(self.labels)
+        # Changes whenever the taxonomy does; pages rendered from it include it in their ETags
+        self.version = hashlib.sha256(json.dumps(groups, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+    def __contains__(self, id_: str) -> bool:
+        return id_ in self.ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def label(self, id_: str) -> str:
+        """Display label of an id, or the id itself if it isn't in the taxonomy"""
+        return self.labels.get(id_, id_)
+
+    def group(self, id_: str) -> Optional[str]:
+        return self.group_of.get(id_)
+
+    def validate(self, ids: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """Submitted ids split into known ones (deduplicated, in order) and unknown ones"""
+        valid, invalid = [], []
+        seen = set()
+        for id_ in ids:
+            if id_ in seen:
+                continue
+            seen.add(id_)
+            (valid if id_ in self.ids else invalid).append(id_)
+        return valid, invalid
+
+
+BOOKS = Taxonomy(BOOK_CATEGORIES)
+ARXIV = Taxonomy(ARXIV_TAXONOMY)
+
+_BY_SOURCE = {"book": BOOKS, "arxiv": ARXIV}
+
+
+def category_label(source: str, category: str) -> str:
+    """Display label of a feed item's category, e.g. ("arxiv", "cs.LG") -> "Machine Learning" """
+    taxonomy = _BY_SOURCE.get(source)
+    return taxonomy.label(category) if taxonomy is not None else category
+
+
+def category_labels(item: Mapping) -> List[str]:
+    """Labels of every category a feed item is listed under"""
+    return [category_label(item['type'], category) for category in item.get('categories') or [item['category']]]
@@ -0,0 +1,39 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+# =====================
+# Published Date Normalization
+# =====================
+# Google Books gives "2024", "2024-05" or "2024-05-12"; arXiv gives "2024-05-12T17:59:59Z"
+_PUBLISHED_RE = re.compile(
+    r"^\s*(\d{4})(?:-(\d{1,2}))?(?:-(\d{1,2}))?"
+    r"(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.\d+)?)?)?"
+    r"\s*(Z|[+-]\d{2}:?\d{2})?"
+)
+
+
+def parse_published(value: Optional[str]) -> float:
+    """
+    Epoch seconds (UTC) of a published date string; partial dates resolve to the start of the
+    period they name. Unparseable or missing dates sort last, as 0.0.
+    """
+    if not value:
+        return 0.0
+    match = _PUBLISHED_RE.match(value)
+    if not match:
+        return 0.0
+    year, month, day, hour, minute, second, offset = match.groups()
+    try:
+        moment = datetime(
+            int(year), int(month or 1), int(day or 1),
+            int(hour or 0), int(minute or 0), int(second or 0),
+            tzinfo=timezone.utc,
+        )
+    except ValueError:
+        return 0.0
+    if offset and offset != "Z":
+        sign = 1 if offset[0] == "+" else -1
+        digits = offset[1:].replace(":", "")
+        moment -= sign * timedelta(hours=int(digits[:2]), minutes=int(digits[2:]))
+    return moment.timestamp()